@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Benchmark growing a live model by linking many parameters.
+
+A model, which is already initialized, gets a number of small Params linked
+to it, once with a single call of link_parameters and once with one call of
+link_parameter per Param. link_parameters connects the hierarchy only once,
+so that its time grows linearly with the number of Params, whereas linking
+one by one reconnects the whole model for every Param.
+
+Results are printed as JSON (one record per number of Params)::
+
+    python benchmarks/link_parameters.py --params 100 1000 10000
+"""
+from __future__ import print_function
+import argparse
+import json
+import timeit
+
+import numpy as np
+
+from paramz import Parameterized, Param, transformations
+
+
+def build_model():
+    m = Parameterized('bench')
+    m.link_parameter(Param('x', np.random.normal(size=10)))
+    return m
+
+
+def new_params(n_params):
+    return [Param('p{}'.format(i), np.random.uniform(.1, 1, 3), transformations.Logexp())
+            for i in range(n_params)]
+
+
+def link_batched(m, params):
+    m.link_parameters(*params)
+
+
+def link_single(m, params):
+    for p in params:
+        m.link_parameter(p)
+
+
+def run(n_params, single_max):
+    result = dict(benchmark='link_parameters', params=n_params)
+    for name, link in [('batched', link_batched), ('single', link_single)]:
+        if name == 'single' and n_params > single_max:
+            continue
+        m, params = build_model(), new_params(n_params)
+        result[name + '_s'] = timeit.timeit(lambda: link(m, params), number=1)
+        assert m.size == 10 + 3 * n_params
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--params', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--single-max', type=int, default=1000,
+                        help="largest number of params to link one by one (quadratic time)")
+    args = parser.parse_args(argv)
+    results = [run(n, args.single_max) for n in args.params]
+    print(json.dumps(results, indent=1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Benchmark looking up parameters of a model by name.
+
+Model code often gets parameters by their dotted name, e.g.
+``m['kern.variance']``, or by regular expression, e.g. ``m['.*variance']``.
+The lookups go through the name index of the model, which is built once
+and memoizes the result of every pattern, instead of traversing the model.
+The time of the first lookup (building the index) and of repeated ones are
+reported.
+
+Results are printed as JSON (one record per model size and pattern)::
+
+    python benchmarks/name_lookup.py --components 10 100 1000
+"""
+from __future__ import print_function
+import argparse
+import json
+import timeit
+
+import numpy as np
+
+from paramz import Parameterized, Param
+
+PATTERNS = ['kern7.variance', '.*lengthscale', 'kern1']
+
+
+def build_model(n_components):
+    m = Parameterized('bench')
+    for i in range(n_components):
+        k = Parameterized('kern{}'.format(i))
+        k.link_parameters(Param('variance', 1.), Param('lengthscale', np.ones(2)))
+        m.link_parameter(k)
+    return m
+
+
+def run(n_components, pattern, number):
+    m = build_model(n_components)
+    first_s = timeit.timeit(lambda: m[pattern], number=1)
+    repeated_s = timeit.timeit(lambda: m[pattern], number=number) / number
+    return dict(benchmark='name_lookup', components=n_components, pattern=pattern,
+                first_us=first_s * 1e6, repeated_us=repeated_s * 1e6)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--components', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--number', type=int, default=1000)
+    args = parser.parse_args(argv)
+    results = [run(n, pattern, args.number) for n in args.components for pattern in PATTERNS]
+    print(json.dumps(results, indent=1))
+
+
+if __name__ == '__main__':
+    main()
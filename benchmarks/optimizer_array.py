@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Check that an optimizer_array round trip does not allocate.
+
+A model with fixed parameters and a mix of constraints (slices and scattered
+index arrays) gets its optimizer_array set and read back repeatedly, as the
+optimizer does in every objective evaluation. The memory allocated during
+the round trips is traced with tracemalloc. After the first round trip, which
+builds the transform plan and its buffers, the peak of allocated memory has
+to stay below a small constant, independent of the size of the model (only
+the small Python objects, e.g. array views, are allocated).
+
+Results are printed as JSON (one record per size); the exit code is non-zero
+if any round trip allocated more than --max-bytes::
+
+    python benchmarks/optimizer_array.py --sizes 100 10000 1000000
+"""
+from __future__ import print_function
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from paramz import Parameterized, Param, transformations
+
+
+def build_model(size):
+    m = Parameterized('bench')
+    a = Param('a', np.random.uniform(.1, 1, size // 2), transformations.Logexp())
+    b = Param('b', np.random.uniform(-1, 1, size - size // 2))
+    m.link_parameters(a, b)
+    a, b = m.a, m.b
+    # scatter constraints and fixes, so that index arrays are needed:
+    b[::3].constrain_bounded(-2, 2, warning=False)
+    a[::5].fix(warning=False)
+    b[1::7].fix(warning=False)
+    m.update_model(False)
+    return m
+
+
+def roundtrip(m, x):
+    m.optimizer_array = x
+    return m.optimizer_array
+
+
+def run(size, repeat):
+    m = build_model(size)
+    x = m.optimizer_array.copy()
+    roundtrip(m, x)  # build the plan and buffers
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(repeat):
+            roundtrip(m, x)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    np.testing.assert_allclose(roundtrip(m, x), x, rtol=1e-10, atol=1e-12)
+    times = timeit.repeat(lambda: roundtrip(m, x), number=1, repeat=repeat)
+    return dict(benchmark='optimizer_array', size=size, size_transformed=x.size,
+                repeat=repeat, peak_allocated_bytes=peak - before,
+                array_bytes=x.nbytes, best_s=min(times), median_s=float(np.median(times)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 1000000])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--max-bytes', type=int, default=16384,
+                        help="maximum peak allocation allowed during the round trips")
+    args = parser.parse_args(argv)
+    results = [run(size, args.repeat) for size in args.sizes]
+    print(json.dumps(results, indent=1))
+    return all(r['peak_allocated_bytes'] <= args.max_bytes for r in results)
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Benchmark the overhead of creating views and slices of a Param.
+
+Model code indexes its Params in every call of parameters_changed, e.g.
+``self.lengthscale[0]`` or ``self.X[:, 1]``. Each of those creates a new
+Param view, which runs Param.__array_finalize__ and Param.__getitem__. The
+time per view is compared to the same indexing of a plain ndarray; the
+ratio is the overhead paramz adds to a view. The metadata of a view (its
+name, gradient, constraints, ...) is timed on a slice of the Param.
+
+To compare with another version of paramz (e.g. from before Params shared
+their metadata with their views), pass a checkout of it as --baseline. The
+benchmark then runs a second time with that checkout on the PYTHONPATH and
+adds its timings as baseline_ns::
+
+    git worktree add /tmp/paramz-before <commit>
+    python benchmarks/param_slicing.py --baseline /tmp/paramz-before
+
+Results are printed as JSON (one record per kind of indexing or access)::
+
+    python benchmarks/param_slicing.py --number 100000 --repeat 5
+"""
+from __future__ import print_function
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+from paramz import Parameterized, Param
+
+INDEXING = [
+    ('element', lambda a: a[0]),
+    ('row', lambda a: a[1]),
+    ('column', lambda a: a[:, 1]),
+    ('slice', lambda a: a[2:5]),
+    ('fancy', lambda a: a[[0, 3, 5]]),
+    ('view', lambda a: a.view()),
+    ('reshape', lambda a: a.reshape(-1)),
+]
+
+ACCESS = [
+    ('name', lambda v: v.name),
+    ('parent', lambda v: v._parent_),
+    ('gradient', lambda v: v.gradient),
+    ('constraints', lambda v: v.constraints),
+    ('hierarchy_name', lambda v: v.hierarchy_name()),
+]
+
+
+def build_model(shape):
+    m = Parameterized('bench')
+    p = Param('X', np.random.normal(size=shape))
+    p = m.link_parameter(p)
+    return m, p
+
+
+def best(stmt, number, repeat):
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def run(name, index, p, number, repeat):
+    a = p.values
+    param_s = best(lambda: index(p), number, repeat)
+    array_s = best(lambda: index(a), number, repeat)
+    return dict(benchmark='param_slicing', indexing=name, number=number,
+                param_ns=param_s * 1e9, ndarray_ns=array_s * 1e9,
+                overhead=param_s / array_s)
+
+
+def run_access(name, access, p, number, repeat):
+    v = p[2:5]
+    param_s = best(lambda: access(v), number, repeat)
+    return dict(benchmark='param_slicing', access=name, number=number,
+                param_ns=param_s * 1e9)
+
+
+def run_baseline(path, argv):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.abspath(path)] + [p for p in [env.get('PYTHONPATH')] if p])
+    out = subprocess.check_output([sys.executable, os.path.abspath(__file__)] + argv, env=env)
+    return json.loads(out.decode())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--shape', type=int, nargs='+', default=[100, 10])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=None,
+                        help="checkout of paramz to compare with")
+    args = parser.parse_args(argv)
+    _, p = build_model(tuple(args.shape))
+    results = [run(name, index, p, args.number, args.repeat) for name, index in INDEXING]
+    results += [run_access(name, access, p, args.number, args.repeat) for name, access in ACCESS]
+    if args.baseline is not None:
+        baseline = run_baseline(args.baseline, ['--shape'] + [str(s) for s in args.shape] +
+                                ['--number', str(args.number), '--repeat', str(args.repeat)])
+        for r, b in zip(results, baseline):
+            r['baseline_ns'] = b['param_ns']
+            r['speedup'] = b['param_ns'] / r['param_ns']
+    print(json.dumps(results, indent=1))
+
+
+if __name__ == '__main__':
+    main()
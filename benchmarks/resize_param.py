@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Benchmark growing a Param of a live model row by row.
+
+Online models add rows to a Param as data arrives (e.g. new latent points).
+Param.append_rows grows the Param in the memory of the model, which has
+spare capacity, whereas replacing the Param by a larger one means unlinking
+the old one and linking the new one.
+
+Results are printed as JSON (one record per number of appended rows)::
+
+    python benchmarks/resize_param.py --rows 100 1000 --columns 5
+"""
+from __future__ import print_function
+import argparse
+import json
+import timeit
+
+import numpy as np
+
+from paramz import Parameterized, Param, transformations
+
+
+def build_model(columns):
+    m = Parameterized('bench')
+    m.link_parameter(Param('kern', np.random.uniform(.1, 1, 10), transformations.Logexp()))
+    m.link_parameter(Param('X', np.random.normal(size=(10, columns))))
+    return m
+
+
+def append_rows(m, rows):
+    for row in rows:
+        m.X.append_rows(row)
+
+
+def relink(m, rows):
+    for row in rows:
+        old = m.X
+        m.unlink_parameter(old)
+        m.link_parameter(Param('X', np.vstack((old.values, row))))
+
+
+def run(n_rows, columns, relink_max):
+    result = dict(benchmark='resize_param', rows=n_rows, columns=columns)
+    rows = np.random.normal(size=(n_rows, 1, columns))
+    for name, grow in [('append_rows', append_rows), ('relink', relink)]:
+        if name == 'relink' and n_rows > relink_max:
+            continue
+        m = build_model(columns)
+        seconds = timeit.timeit(lambda: grow(m, rows), number=1)
+        assert m.X.shape == (10 + n_rows, columns)
+        result[name + '_us_per_row'] = seconds / n_rows * 1e6
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--columns', type=int, default=5)
+    parser.add_argument('--relink-max', type=int, default=1000,
+                        help="largest number of rows to add by relinking (quadratic time)")
+    args = parser.parse_args(argv)
+    results = [run(n, args.columns, args.relink_max) for n in args.rows]
+    print(json.dumps(results, indent=1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Benchmark the per evaluation overhead of the transformations between
+optimizer space and model space.
+
+A model with a fixed total number of parameters gets split into a varying
+number of constrained Params. One evaluation consists of setting the
+optimizer_array, reading it back and transforming a gradient, as the
+optimizer does in every objective evaluation. The model update is switched
+off, so that only the transformation overhead gets measured. With a compiled
+transform plan, it should not depend on the number of Params.
+
+Results are printed as JSON (one record per configuration)::
+
+    python benchmarks/transform_plan.py --size 10000 --params 1 10 100 --repeat 200
+"""
+from __future__ import print_function
+import argparse
+import json
+import timeit
+
+import numpy as np
+
+from paramz import Parameterized, Param, transformations
+
+
+def build_model(size, n_params, fix_every=0):
+    m = Parameterized('bench')
+    sizes = np.diff(np.linspace(0, size, n_params + 1).astype(int))
+    params = [Param('p{}'.format(i), np.random.uniform(.1, 1, s), transformations.Logexp())
+              for i, s in enumerate(sizes)]
+    m.link_parameters(*params)
+    if fix_every:
+        for p in m.parameters[::fix_every]:
+            p[:1].fix(warning=False)
+    m.update_model(False)
+    return m
+
+
+def evaluation(m, x, g):
+    m.optimizer_array = x
+    m.optimizer_array
+    m._transform_gradients(g.copy())
+
+
+def run(size, n_params, repeat, fix_every=0):
+    m = build_model(size, n_params, fix_every)
+    x = m.optimizer_array.copy()
+    g = np.ones(m.size)
+    evaluation(m, x, g)  # build the plan
+    times = timeit.repeat(lambda: evaluation(m, x, g), number=1, repeat=repeat)
+    return dict(benchmark='transform_plan', size=size, n_params=n_params,
+                fixes=bool(fix_every), repeat=repeat,
+                best_s=min(times), median_s=float(np.median(times)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--params', type=int, nargs='+', default=[1, 10, 100, 300])
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args(argv)
+    results = []
+    for fix_every in (0, 2):
+        for n_params in args.params:
+            results.append(run(args.size, n_params, args.repeat, fix_every))
+    print(json.dumps(results, indent=1))
+    return results
+
+
+if __name__ == '__main__':
+    main()
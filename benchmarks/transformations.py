@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark and accuracy check of paramz.transformations.
+
+For each transformation, f, finv and gradfactor are timed on arrays of
+sizes 1 to 10^7, for different regimes of (optimizer space) values:
+
+    normal:           standard normal values
+    near_lim:         around _lim_val, where Logexp switches to the identity
+    very_negative:    -800 to -40, where the exponentials underflow
+    logistic_bounds:  +-(20 to 40), which maps close to the Logistic bounds
+
+finv and gradfactor get f(x) as input. Each method is timed allocating the
+result and writing it into a preallocated out array (with workspace).
+
+The accuracy of the round trip finv(f(x)) is reported per regime as the
+maximum absolute error, relative to max(1, |x|), over the finite round trips
+and the number of round trips, which are not finite. Regimes where f
+saturates (e.g. Logexp for very negative values) can not be inverted, and
+Square can not recover the sign of x.
+
+All results are printed as JSON, or written to --output::
+
+    python benchmarks/transformations.py --max-size 1000000 --output transformations.json
+"""
+from __future__ import print_function
+import argparse
+import json
+import timeit
+
+import numpy as np
+
+from paramz import transformations
+from paramz.transformations import _lim_val
+
+TRANSFORMATIONS = [transformations.Logexp(), transformations.Exponent(),
+                   transformations.NegativeLogexp(), transformations.NegativeExponent(),
+                   transformations.Square(), transformations.Logistic(-2., 3.)]
+
+def regime(name, size, rs):
+    if name == 'normal':
+        return rs.normal(0, 1, size)
+    if name == 'near_lim':
+        return _lim_val + rs.uniform(-1, 1, size)
+    if name == 'very_negative':
+        return rs.uniform(-800, -40, size)
+    if name == 'logistic_bounds':
+        return rs.choice([-1., 1.], size) * rs.uniform(20, 40, size)
+    raise ValueError("Unknown regime {}".format(name))
+
+REGIMES = ['normal', 'near_lim', 'very_negative', 'logistic_bounds']
+
+
+def _calls(c, x):
+    fx = c.f(x)
+    df = np.ones_like(x)
+    out = np.empty_like(x)
+    workspace = np.empty_like(x)
+    yield 'f', 'alloc', lambda: c.f(x)
+    yield 'f', 'out', lambda: c.f(x, out, workspace)
+    yield 'finv', 'alloc', lambda: c.finv(fx)
+    yield 'finv', 'out', lambda: c.finv(fx, out, workspace)
+    yield 'gradfactor', 'alloc', lambda: c.gradfactor(fx, df)
+    yield 'gradfactor', 'out', lambda: c.gradfactor(fx, df, out, workspace)
+
+
+def throughput(c, size, regime_name, rs, repeat=3):
+    x = regime(regime_name, size, rs)
+    number = max(1, int(1e3 // size))
+    results = []
+    with np.errstate(all='ignore'):
+        for method, mode, call in _calls(c, x):
+            t = min(timeit.repeat(call, number=number, repeat=repeat)) / number
+            results.append(dict(benchmark='throughput', transformation=repr(c), domain=str(c),
+                                method=method, mode=mode, size=size, regime=regime_name,
+                                time_s=t, elements_per_s=size / t if t > 0 else None))
+    return results
+
+
+def accuracy(c, regime_name, rs, size=100000):
+    x = regime(regime_name, size, rs)
+    with np.errstate(all='ignore'):
+        roundtrip = c.finv(c.f(x))
+    finite = np.isfinite(roundtrip)
+    err = np.abs(roundtrip[finite] - x[finite]) / np.maximum(1., np.abs(x[finite]))
+    return dict(benchmark='roundtrip', transformation=repr(c), domain=str(c),
+                regime=regime_name, size=size,
+                max_error=float(err.max()) if err.size else None,
+                mean_error=float(err.mean()) if err.size else None,
+                not_finite=int((~finite).sum()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--max-size', type=int, default=10**7)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', type=str, default=None, help="file to write the JSON results to")
+    args = parser.parse_args(argv)
+    rs = np.random.RandomState(args.seed)
+    sizes = [10**i for i in range(int(np.log10(args.max_size)) + 1)]
+    results = []
+    for c in TRANSFORMATIONS:
+        for regime_name in REGIMES:
+            results.append(accuracy(c, regime_name, rs))
+            for size in sizes:
+                results.extend(throughput(c, size, regime_name, rs, args.repeat))
+    if args.output is None:
+        print(json.dumps(results, indent=1))
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Benchmark pruning a live model by unlinking its parameters one by one.
+
+A model with a number of small components (like mixture components or
+inducing inputs) gets its components unlinked one at a time, as models do,
+which prune components while they are being optimized. The unlinked
+parameter keeps its memory, so every unlink lays the model out in new memory,
+replacing each of its parameters by a view of it in one pass.
+
+Results are printed as JSON (one record per number of components)::
+
+    python benchmarks/unlink_parameters.py --components 100 1000 --remove 100
+"""
+from __future__ import print_function
+import argparse
+import json
+import timeit
+
+import numpy as np
+
+from paramz import Parameterized, Param, transformations
+
+
+def build_model(n_components, size):
+    m = Parameterized('bench')
+    m.link_parameter(Param('x', np.random.normal(size=size)))
+    components = [Param('c{}'.format(i), np.random.uniform(.1, 1, 3), transformations.Logexp())
+                  for i in range(n_components)]
+    m.link_parameters(*components)
+    return m, components
+
+
+def unlink(m, components):
+    for c in components:
+        m.unlink_parameter(c)
+
+
+def run(n_components, n_remove, size):
+    m, components = build_model(n_components, size)
+    remove = components[-n_remove:]
+    seconds = timeit.timeit(lambda: unlink(m, remove), number=1)
+    assert m.size == size + 3 * (n_components - n_remove)
+    return dict(benchmark='unlink_parameters', components=n_components, removed=n_remove,
+                size=size, total_s=seconds, per_unlink_ms=seconds / n_remove * 1e3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--components', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--remove', type=int, default=50)
+    parser.add_argument('--size', type=int, default=100000,
+                        help="size of the parameter before the components")
+    args = parser.parse_args(argv)
+    results = [run(n, min(args.remove, n), args.size) for n in args.components]
+    print(json.dumps(results, indent=1))
+
+
+if __name__ == '__main__':
+    main()
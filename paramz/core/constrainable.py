@@ -31,6 +31,9 @@ import numpy as np
 from .indexable import Indexable
 from ..transformations import Transformation,Logexp, NegativeLogexp, Logistic, __fixed__, FIXED, UNFIXED
 
+# marks the fixes to be rebuilt from the constraints (see Constrainable._fixes_):
+_outdated = object()
+
 class Constrainable(Indexable):
     def __init__(self, name, default_constraint=None, *a, **kw):
         super(Constrainable, self).__init__(name=name)
@@ -82,36 +85,96 @@ class Constrainable(Indexable):
         return unconstrained
     unfix = unconstrain_fixed
 
-    def _ensure_fixes(self):
-        # Ensure that the fixes array is set:
-        # Parameterized: ones(self.size)
-        # Param: ones(self._realsize_
-        if (not hasattr(self, "_fixes_")) or (self._fixes_ is None) or (self._fixes_.size != self.size):
-            self._fixes_ = np.ones(self.size, dtype=bool)
-            self._fixes_[self.constraints[__fixed__]] = FIXED
+    @property
+    def _fixes_(self):
+        """
+        The boolean mask of the free (UNFIXED) parameters of this highest
+        parent, None if none of them is fixed.
 
+        It gets built from the fixed constraints when it is asked for, so that
+        fixing and unfixing does not go through an array of the size of the
+        model (the optimizer uses the index map below instead).
+        """
+        fixes = self.__dict__.get('_fixes_', None)
+        if fixes is _outdated:
+            fixes = None
+            fixed = self.constraints[__fixed__]
+            if fixed.size > 0:
+                fixes = np.ones(self.size, dtype=bool)
+                fixes[fixed] = FIXED
+            self.__dict__['_fixes_'] = fixes
+        return fixes
+
+    @_fixes_.setter
+    def _fixes_(self, fixes):
+        self.__dict__['_fixes_'] = fixes
 
     def _set_fixed(self, param, index):
-        self._ensure_fixes()
-        offset = self._offset_for(param)
-        self._fixes_[index+offset] = FIXED
-        if np.all(self._fixes_): self._fixes_ = None  # ==UNFIXED
+        self._fixes_ = _outdated
+        self._update_transformed_index_map()
 
     def _set_unfixed(self, param, index):
-        self._ensure_fixes()
-        offset = self._offset_for(param)
-        self._fixes_[index+offset] = UNFIXED
-        if np.all(self._fixes_): self._fixes_ = None  # ==UNFIXED
+        self._fixes_ = _outdated
+        self._update_transformed_index_map()
 
     def _connect_fixes(self):
-        fixed_indices = self.constraints[__fixed__]
-        if fixed_indices.size > 0:
-            self._ensure_fixes()
-            self._fixes_[:] = UNFIXED
-            self._fixes_[fixed_indices] = FIXED
-        else:
-            self._fixes_ = None
+        if self.constraints[__fixed__].size == 0:
             del self.constraints[__fixed__]
+        self._fixes_ = _outdated
+        self._update_transformed_index_map()
+
+    #===========================================================================
+    # Mapping between indices of the parameter and the optimizer array
+    #===========================================================================
+    def _update_transformed_index_map(self):
+        """
+        The map between the (raveled) indices of the parameters and the
+        indices of the optimizer array (the transformed indices, which skip
+        the fixed parameters).
+
+        It is stored in terms of the runs of fixed parameters, so that it
+        is O(number of runs) to build and O(log(number of runs)) per index to
+        evaluate:
+
+            ends:   the end of each run of fixed parameters
+            before: the number of fixed parameters before each run, and in total
+            starts: the transformed index of the first free parameter after
+                    each run (the first entry for the parameters before all runs)
+        """
+        runs = dict(self.constraints._run_items()).get(__fixed__, None)
+        if runs is None:
+            runs = np.empty((0, 2), dtype=int)
+        before = np.r_[0, np.cumsum(runs[:, 1] - runs[:, 0])]
+        ends = runs[:, 1]
+        starts = np.r_[0, ends - before[1:]]
+        self._transformed_index_map_ = runs[:, 0], ends, before, starts
+
+    def _transformed_index_map(self):
+        # only the highest parent keeps its map up to date with the fixes:
+        if self.has_parent() or self.__dict__.get('_transformed_index_map_', None) is None:
+            self._update_transformed_index_map()
+        return self._transformed_index_map_
+
+    def _transformed_index(self, index):
+        """
+        Map the raveled indices `index` of the parameter array to the
+        indices in the optimizer array. Fixed parameters are left out.
+        """
+        run_starts, ends, before, _ = self._transformed_index_map()
+        index = np.asarray(index, dtype=int)
+        k = np.searchsorted(ends, index, side='right')
+        free = k == run_starts.size
+        free[~free] = index[~free] < run_starts[k[~free]]
+        return index[free] - before[k[free]]
+
+    def _untransformed_index(self, transformed_index):
+        """
+        Map the indices of the optimizer array to the raveled indices of
+        the parameter array, the inverse of _transformed_index.
+        """
+        _, _, before, starts = self._transformed_index_map()
+        transformed_index = np.asarray(transformed_index, dtype=int)
+        return transformed_index + before[np.searchsorted(starts, transformed_index, side='right') - 1]
 
     #===========================================================================
     # Convenience for fixed
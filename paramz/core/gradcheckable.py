@@ -41,7 +41,7 @@ class Gradcheckable(Pickleable, Parentable):
     def __init__(self, *a, **kw):
         super(Gradcheckable, self).__init__(*a, **kw)
 
-    def checkgrad(self, verbose=0, step=1e-6, tolerance=1e-3, df_tolerance=1e-12):
+    def checkgrad(self, verbose=0, step=None, tolerance=1e-3, df_tolerance=1e-12):
         """
         Check the gradient of this parameter with respect to the highest parent's
         objective function.
@@ -51,7 +51,8 @@ class Gradcheckable(Pickleable, Parentable):
         analytical gradient is smaller then tolerance.
 
         :param bool verbose: whether each parameter shall be checked individually.
-        :param float step: the stepsize for the numerical three point gradient estimate.
+        :param float step: the stepsize for the numerical three point gradient estimate
+            (default 1e-6 for float64, scaled to the resolution of the dtype of the model otherwise).
         :param float tolerance: the tolerance for the gradient ratio or difference.
         :param float df_tolerance: the tolerance for df_tolerance
 
@@ -68,7 +69,7 @@ class Gradcheckable(Pickleable, Parentable):
             return self._highest_parent_._checkgrad(self, verbose=verbose, step=step, tolerance=tolerance, df_tolerance=df_tolerance)
         return self._checkgrad(self, verbose=verbose, step=step, tolerance=tolerance, df_tolerance=df_tolerance)
 
-    def _checkgrad(self, param, verbose=0, step=1e-6, tolerance=1e-3, df_tolerance=1e-12):
+    def _checkgrad(self, param, verbose=0, step=None, tolerance=1e-3, df_tolerance=1e-12):
         """
         Perform the checkgrad on the model.
         TODO: this can be done more efficiently, when doing it inside here
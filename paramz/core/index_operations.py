@@ -29,9 +29,6 @@
 #===============================================================================
 
 import numpy
-from numpy.lib.function_base import vectorize
-from .lists_and_dicts import IntArrayDict
-from functools import reduce
 
 def extract_properties_to_index(index, props):
     prop_index = dict()
@@ -82,51 +79,85 @@ class ParameterIndexOperations(object):
     This global index then stores the key and the appropriate global index
     (which can be seen by the view).
 
+    Internally the indices of each key are stored run-length encoded, as a
+    (k, 2) array of sorted, disjoint [start, stop) runs (see
+    :func:`index_to_runs`). Constraints mostly cover whole parameters, so k
+    stays small and adding, removing and shifting cost O(k) instead of
+    O(n log n). The dense int arrays are only expanded (and cached) when
+    they are asked for.
+
+    Every modification increments ``_version``, so that views can cache their
+    filtered local indices and only recompute them after the global index
+    has changed.
+
     See also:
     ParameterIndexOperationsView
 
     """
     _offset = 0
+    _version = 0
     def __init__(self, constraints=None):
-        self._properties = IntArrayDict()
+        self._properties = dict()
+        self._dense = dict()
         if constraints is not None:
             #python 3 fix
             for t, i in constraints.items():
                 self.add(t, i)
 
-    def items(self):
-        for i, ind in self._properties.items():
+    def __getstate__(self):
+        return dict(_properties=self._properties)
+
+    def __setstate__(self, state):
+        self._properties = dict()
+        self._dense = dict()
+        # pickles from before the run-length storage hold dense int arrays:
+        for prop, ind in state['_properties'].items():
+            ind = numpy.asarray(ind, dtype=int)
+            if ind.ndim == 1:
+                ind = index_to_runs(ind)
             if ind.size > 0:
-                yield i, ind
+                self._properties[prop] = ind
+
+    def _set_runs(self, prop, runs):
+        self._version += 1
+        self._dense.pop(prop, None)
+        if runs.shape[0] > 0:
+            self._properties[prop] = runs
+        else:
+            self._properties.pop(prop, None)
+
+    def _run_items(self):
+        """
+        Iterate over (property, runs) pairs without expanding the runs.
+        """
+        return list(self._properties.items())
+
+    def items(self):
+        for i in list(self._properties.keys()):
+            yield i, self[i]
 
     def properties(self):
-        return [i[0] for i in self.items()]
+        return list(self._properties.keys())
 
     def indices(self):
         return [i[1] for i in self.items()]
 
     def shift_right(self, start, size):
-        for ind in self.indices():
-            toshift = ind>=start
-            ind[toshift] += size
+        for prop, runs in self._run_items():
+            self._set_runs(prop, shift_runs_right(runs, start, size))
 
     def shift_left(self, start, size):
-        for v, ind in list(self.items()):
-            todelete = (ind>=start) * (ind<start+size)
-            if todelete.sum() != 0:
-                ind = ind[~todelete]
-            toshift = ind>=start
-            if toshift.size != 0:
-                ind[toshift] -= size
-            if ind.size != 0: self._properties[v] = ind
-            else: del self._properties[v]
+        for prop, runs in self._run_items():
+            self._set_runs(prop, shift_runs_left(runs, start, size))
 
     def clear(self):
+        self._version += 1
         self._properties.clear()
+        self._dense.clear()
 
     @property
     def size(self):
-        return sum([i.size for i in self.indices()])
+        return sum([runs_size(runs) for runs in self._properties.values()])
 
 
     def properties_for(self, index):
@@ -140,7 +171,7 @@ class ParameterIndexOperations(object):
         >>> properties_for([2,3,5])
         [['one'], ['one', 'two'], ['two']]
         """
-        return vectorize(lambda i: [prop for prop in self.properties() if i in self[prop]], otypes=[list])(index)
+        return properties_for(self._run_items(), index)
 
     def properties_dict_for(self, index):
         """
@@ -154,81 +185,295 @@ class ParameterIndexOperations(object):
         >>> properties_dict_for([2,3,5])
         {'one':[2,3], 'two':[3,5]}
         """
-        props = self.properties_for(index)
-        prop_index = extract_properties_to_index(index, props)
-        return prop_index
+        return properties_dict_for(self._run_items(), index)
 
     def add(self, prop, indices):
-        self._properties[prop] = combine_indices(self._properties[prop], indices)
+        self._add_runs(prop, index_to_runs(indices))
+
+    def _add_runs(self, prop, runs):
+        if prop in self._properties:
+            runs = combine_runs(self._properties[prop], runs)
+        self._set_runs(prop, runs)
 
     def remove(self, prop, indices):
         if prop in self._properties:
-            diff = remove_indices(self[prop], indices)
-            removed = numpy.intersect1d(self[prop], indices, True)
-            if not index_empty(diff):
-                self._properties[prop] = diff
-            else:
-                del self._properties[prop]
-            return removed.astype(int)
+            runs = self._properties[prop]
+            to_remove = index_to_runs(indices)
+            removed = intersect_runs(runs, to_remove)
+            self._set_runs(prop, remove_runs(runs, to_remove))
+            return runs_to_index(removed)
         return numpy.array([]).astype(int)
 
     def update(self, parameter_index_view, offset=0):
         #py3 fix
-        for i, v in parameter_index_view.items():
-            self.add(i, v+offset)
+        if isinstance(parameter_index_view, (ParameterIndexOperations, ParameterIndexOperationsView)):
+            for i, runs in parameter_index_view._run_items():
+                self._add_runs(i, runs+offset)
+        else:
+            for i, v in parameter_index_view.items():
+                self.add(i, v+offset)
 
     def copy(self):
         return self.__deepcopy__(None)
 
     def __deepcopy__(self, memo):
         #py3 fix
-        return ParameterIndexOperations(dict(self.items()))
+        c = ParameterIndexOperations()
+        c._properties = dict((prop, runs.copy()) for prop, runs in self._properties.items())
+        return c
 
     def __getitem__(self, prop):
-        return self._properties[prop]
+        """
+        The sorted index of prop. The index is cached until the next change
+        and therefore read-only, copy it to change it.
+        """
+        try:
+            return self._dense[prop]
+        except KeyError:
+            pass
+        if prop not in self._properties:
+            return numpy.array([], dtype=int)
+        ind = runs_to_index(self._properties[prop])
+        ind.flags.writeable = False
+        self._dense[prop] = ind
+        return ind
 
     def __delitem__(self, prop):
-        del self._properties[prop]
+        self._version += 1
+        self._properties.pop(prop, None)
+        self._dense.pop(prop, None)
 
     def __str__(self, *args, **kwargs):
         import pprint
-        return pprint.pformat(dict(self._properties))
+        return pprint.pformat(dict(self.items()))
 
-def combine_indices(arr1, arr2):
-    return numpy.union1d(arr1, arr2)
+#===============================================================================
+# Run-length encoded indices
+#===============================================================================
+def _empty_runs():
+    return numpy.empty((0, 2), dtype=int)
+
+def index_to_runs(index):
+    """
+    Compress an integer index into a (k, 2) array of sorted, disjoint and
+    non-adjacent [start, stop) runs.
 
-def remove_indices(arr, to_remove):
-    return numpy.setdiff1d(arr, to_remove, True)
+    >>> index_to_runs([0, 1, 2, 5, 6, 9])
+    array([[ 0,  3],
+           [ 5,  7],
+           [ 9, 10]])
+    """
+    index = numpy.asarray(index, dtype=int).ravel()
+    if index.size == 0:
+        return _empty_runs()
+    if index.size > 1 and not numpy.all(index[1:] > index[:-1]):
+        # only sort, if we have to
+        index = numpy.unique(index)
+    breaks = numpy.flatnonzero(index[1:] != index[:-1] + 1) + 1
+    starts = index[numpy.r_[0, breaks]]
+    stops = index[numpy.r_[breaks - 1, index.size - 1]] + 1
+    return numpy.column_stack((starts, stops))
+
+def runs_to_index(runs):
+    """
+    Expand the runs given into the dense, sorted int array they encode.
+    """
+    lengths = runs[:, 1] - runs[:, 0]
+    ends = numpy.cumsum(lengths)
+    return numpy.arange(ends[-1] if ends.size else 0, dtype=int) + numpy.repeat(runs[:, 0] - (ends - lengths), lengths)
+
+def runs_size(runs):
+    return int((runs[:, 1] - runs[:, 0]).sum())
+
+def _merge_adjacent_runs(runs):
+    if runs.shape[0] < 2:
+        return runs
+    new = numpy.r_[True, runs[1:, 0] != runs[:-1, 1]]
+    last = numpy.r_[new[1:], True]
+    return numpy.column_stack((runs[new, 0], runs[last, 1]))
+
+def _runs_cover(runs, points):
+    # which of the (sorted) points lie inside of one of the runs
+    if runs.shape[0] == 0:
+        return numpy.zeros(points.shape, dtype=bool)
+    i = numpy.searchsorted(runs[:, 0], points, 'right') - 1
+    return (i >= 0) & (points < runs[numpy.maximum(i, 0), 1])
+
+def _combine_runs(runs1, runs2, op):
+    # The run boundaries split the integers into segments, in which the
+    # membership in runs1 and runs2 stays constant:
+    bounds = numpy.unique(numpy.concatenate((runs1.ravel(), runs2.ravel())))
+    if bounds.size < 2:
+        return _empty_runs()
+    lo, hi = bounds[:-1], bounds[1:]
+    keep = op(_runs_cover(runs1, lo), _runs_cover(runs2, lo))
+    return _merge_adjacent_runs(numpy.column_stack((lo[keep], hi[keep])))
+
+def combine_runs(runs1, runs2):
+    return _combine_runs(runs1, runs2, numpy.logical_or)
+
+def remove_runs(runs, to_remove):
+    return _combine_runs(runs, to_remove, lambda a, b: a & ~b)
+
+def intersect_runs(runs1, runs2):
+    return _combine_runs(runs1, runs2, numpy.logical_and)
+
+def property_membership(run_items, index):
+    """
+    Return a boolean matrix of shape (index.size, len(run_items)), saying
+    for each element of the index, whether it lies in the runs of each
+    property. This is a binary search per element and property, instead of
+    a linear scan through the property indices.
+    """
+    index = numpy.asarray(index, dtype=int).ravel()
+    membership = numpy.zeros((index.size, len(run_items)), dtype=bool)
+    for j, (_, runs) in enumerate(run_items):
+        membership[:, j] = _runs_cover(runs, index)
+    return membership
 
-def index_empty(index):
-    return numpy.size(index) == 0
+def properties_for(run_items, index):
+    """
+    Vectorized version of ParameterIndexOperations.properties_for.
+
+    Each distinct combination of properties gets one list, which is shared
+    between all elements carrying that combination.
+    """
+    shape = numpy.shape(index)
+    membership = property_membership(run_items, index)
+    props = [i for i, _ in run_items]
+    if membership.shape[0] == 0:
+        return numpy.empty(shape, dtype=object)
+    if len(props) < 63:
+        # one integer code per element, bit j set for property j
+        codes = membership.dot(numpy.left_shift(1, numpy.arange(len(props), dtype=numpy.int64)))
+        codes, inverse = numpy.unique(codes, return_inverse=True)
+        combinations = (codes[:, None] >> numpy.arange(len(props))) & 1
+    else:
+        # one opaque (void) code per element, made of its row of memberships:
+        membership = numpy.ascontiguousarray(membership)
+        codes = membership.view(numpy.dtype((numpy.void, membership.shape[1]))).ravel()
+        codes, inverse = numpy.unique(codes, return_inverse=True)
+        combinations = codes.view(bool).reshape(-1, membership.shape[1])
+    lists = numpy.empty(combinations.shape[0], dtype=object)
+    for k, row in enumerate(combinations):
+        lists[k] = [prop for prop, member in zip(props, row) if member]
+    return lists[inverse.ravel()].reshape(shape)
+
+def properties_dict_for(run_items, index):
+    """
+    Vectorized version of ParameterIndexOperations.properties_dict_for.
+    """
+    index = numpy.asarray(index, dtype=int).ravel()
+    membership = property_membership(run_items, index)
+    prop_index = dict()
+    for j, (prop, _) in enumerate(run_items):
+        if membership[:, j].any():
+            prop_index[prop] = index[membership[:, j]]
+    return prop_index
+
+def shift_runs_right(runs, start, size):
+    """
+    Open a gap of size at start, runs going over start are split in two.
+    """
+    straddle = (runs[:, 0] < start) & (runs[:, 1] > start)
+    runs = runs.copy()
+    if straddle.any():
+        tails = runs[straddle]
+        tails[:, 0] = start
+        runs[straddle, 1] = start
+        runs = numpy.concatenate((runs, tails))
+        runs = runs[numpy.argsort(runs[:, 0], kind='mergesort')]
+    runs[runs[:, 0] >= start] += size
+    return runs
+
+def shift_runs_left(runs, start, size):
+    """
+    Delete the indices [start, start+size) and close the gap.
+    """
+    runs = remove_runs(runs, numpy.array([[start, start + size]]))
+    runs[runs[:, 0] >= start] -= size
+    return _merge_adjacent_runs(runs)
 
 class ParameterIndexOperationsView(object):
+    """
+    A view on the global ParameterIndexOperations (or another view), which
+    maps the global indices in [offset, offset+size) to local indices
+    starting at 0.
+
+    The filtered local indices are cached and only recomputed, when the
+    ``_version`` of the global index operations changed. Thus, repeated
+    queries on an unchanged index cost O(local size).
+
+    If the view is created on another view, the offset is stored relative
+    to that (parent) view and the global offset gets resolved through the
+    parent. The view itself always operates on the global index operations
+    directly. Moving a whole block of parameters thus only needs the
+    relative offset of the top view of the block to change.
+    """
     def __init__(self, param_index_operations, offset, size):
-        self._param_index_ops = param_index_operations
-        self._offset = offset
+        if isinstance(param_index_operations, ParameterIndexOperationsView):
+            self._parent_view = param_index_operations
+            self._param_index_ops = param_index_operations._param_index_ops
+        else:
+            self._parent_view = None
+            self._param_index_ops = param_index_operations
+        self._relative_offset = offset
         self._size = size
+        self._clear_cache()
 
     def __getstate__(self):
-        return [self._param_index_ops, self._offset, self._size]
+        return [self._param_index_ops, self._offset, self._size, self._parent_view]
 
     def __setstate__(self, state):
         self._param_index_ops = state[0]
-        self._offset = state[1]
         self._size = state[2]
+        self._parent_view = state[3] if len(state) > 3 else None
+        self._relative_offset = 0
+        self._offset = state[1]
+        self._clear_cache()
 
-    def _filter_index(self, ind):
-        return ind[(ind >= self._offset) * (ind < (self._offset + self._size))] - self._offset
+    @property
+    def _offset(self):
+        if self._parent_view is None:
+            return self._relative_offset
+        return self._relative_offset + self._parent_view._offset
+
+    @_offset.setter
+    def _offset(self, offset):
+        self._relative_offset += offset - self._offset
+
+    def _clear_cache(self):
+        self._cache_key = None
+        self._local_runs = None
+        self._dense = dict()
+
+    @property
+    def _version(self):
+        return self._param_index_ops._version
+
+    def _run_items(self):
+        """
+        Iterate over (property, local runs) pairs, without expanding the runs.
+        """
+        key = (self._version, self._offset, self._size)
+        if self._cache_key != key:
+            local_runs = []
+            lo, hi = self._offset, self._offset + self._size
+            for i, runs in self._param_index_ops._run_items():
+                runs = runs[(runs[:, 1] > lo) & (runs[:, 0] < hi)]
+                if runs.shape[0] > 0:
+                    local_runs.append((i, numpy.clip(runs, lo, hi) - lo))
+            self._local_runs = local_runs
+            self._dense = dict()
+            self._cache_key = key
+        return self._local_runs
 
     def items(self):
-        _items_list = self._param_index_ops.items()
-        for i, ind in _items_list:
-            ind2 = self._filter_index(ind)
-            if ind2.size > 0:
-                yield i, ind2
-    
+        for i, _ in self._run_items():
+            yield i, self[i]
+
     def properties(self):
-        return [i[0] for i in self.items()]
+        return [i for i, _ in self._run_items()]
 
     def indices(self):
         return [i[1] for i in self.items()]
@@ -245,7 +490,7 @@ class ParameterIndexOperationsView(object):
 
     @property
     def size(self):
-        return sum([i.size for i in self.indices()])
+        return sum([runs_size(runs) for _, runs in self._run_items()])
 
     def properties_for(self, index):
         """
@@ -258,7 +503,7 @@ class ParameterIndexOperationsView(object):
         >>> properties_for([2,3,5])
         [['one'], ['one', 'two'], ['two']]
         """
-        return vectorize(lambda i: [prop for prop in self.properties() if i in self[prop]], otypes=[list])(index)
+        return properties_for(self._run_items(), index)
 
     def properties_dict_for(self, index):
         """
@@ -272,7 +517,7 @@ class ParameterIndexOperationsView(object):
         >>> property_dict_for([2,3,5])
         {'one':[2,3], 'two':[3,5]}
         """
-        return extract_properties_to_index(index, self.properties_for(index))
+        return properties_dict_for(self._run_items(), index)
 
 
     def add(self, prop, indices):
@@ -287,8 +532,22 @@ class ParameterIndexOperationsView(object):
 
 
     def __getitem__(self, prop):
-        ind = self._filter_index(self._param_index_ops[prop])
-        return ind
+        """
+        The sorted index of prop. The index is cached until the next change
+        and therefore read-only, copy it to change it.
+        """
+        local_runs = self._run_items()
+        try:
+            return self._dense[prop]
+        except KeyError:
+            pass
+        for i, runs in local_runs:
+            if i == prop:
+                ind = runs_to_index(runs)
+                ind.flags.writeable = False
+                self._dense[prop] = ind
+                return ind
+        return numpy.array([], dtype=int)
 
     def __delitem__(self, prop):
         self.remove(prop, self[prop])
@@ -299,9 +558,7 @@ class ParameterIndexOperationsView(object):
         return pprint.pformat(dict(self.items()))
 
     def update(self, parameter_index_view, offset=0):
-        #py3 fixes
-        for i, v in parameter_index_view.items():
-            self.add(i, v+offset)
+        self._param_index_ops.update(parameter_index_view, offset+self._offset)
 
 
     def copy(self):
@@ -309,6 +566,8 @@ class ParameterIndexOperationsView(object):
 
     def __deepcopy__(self, memo):
         #py3 fix
-        return ParameterIndexOperations(dict(self.items()))
+        c = ParameterIndexOperations()
+        c._properties = dict((prop, runs.copy()) for prop, runs in self._run_items())
+        return c
     pass
 
@@ -32,7 +32,6 @@ from .nameable import Nameable
 from .updateable import Updateable
 from ..transformations import __fixed__
 from operator import delitem
-from functools import reduce
 from collections import OrderedDict
 import logging
 
@@ -121,6 +120,7 @@ class Indexable(Nameable, Updateable):
         #self.constraints = constr
         self._parent_ = None
         self._parent_index_ = None
+        self._highest_parent_changed()
         self._connect_fixes()
         self._notify_parent_change()
 
@@ -134,12 +134,30 @@ class Indexable(Nameable, Updateable):
         basically just sums up the parameter sizes which come before param.
         """
         if param.has_parent():
-            p = param._parent_._get_original(param)
-            if p in self.parameters:
-                return reduce(lambda a,b: a + b.size, self.parameters[:p._parent_index_], 0)
+            if param._parent_ is self:
+                p = self._get_original(param)
+                return self._parameter_offsets()[p._parent_index_]
             return self._offset_for(param._parent_) + param._parent_._offset_for(param)
         return 0
 
+    def _parameter_offsets(self):
+        """
+        The prefix sums of the sizes of the direct children, i.e. the offset
+        of each child inside this object, followed by the total size.
+
+        It gets built lazily and is kept up to date by linking and unlinking
+        parameters (see :py:meth:`_children_size_changed`), so that looking
+        up an offset does not need to sum up all previous children.
+        """
+        offsets = self.__dict__.get('_parameter_offsets_', None)
+        if offsets is None:
+            offsets = [0]
+            for p in self.parameters:
+                offsets.append(offsets[-1] + p.size)
+            # set directly, as Parameterized.__setattr__ checks the parameter names:
+            self.__dict__['_parameter_offsets_'] = offsets
+        return offsets
+
     ### Global index operations (from highest_parent)
     ### These indices are for gradchecking, so that we
     ### can index the optimizer array and manipulate it directly
@@ -158,7 +176,7 @@ class Indexable(Nameable, Updateable):
         """
         from ..param import ParamConcatenation
         if isinstance(param, ParamConcatenation):
-            return np.hstack((self._raveled_index_for(p) for p in param.params))
+            return np.hstack([self._raveled_index_for(p) for p in param.params])
         return param._raveled_index() + self._offset_for(param)
 
     def _raveled_index_for_transformed(self, param):
@@ -176,10 +194,8 @@ class Indexable(Nameable, Updateable):
         """
         ravi = self._raveled_index_for(param)
         if self._has_fixes():
-            fixes = self._fixes_
             ### Transformed indices, handling the offsets of previous fixes
-            transformed = (np.r_[:self.size] - (~fixes).cumsum())
-            return transformed[ravi[fixes[ravi]]]
+            return self._transformed_index(ravi)
         else:
             return ravi
 
@@ -224,6 +240,10 @@ class Indexable(Nameable, Updateable):
 
         update the constraints and priors view, so that
         constraining is automized for the parent.
+
+        The views are relative: each view only stores the offset inside
+        the view of its parent, the global offset gets resolved lazily
+        through the chain of views.
         """
         from .index_operations import ParameterIndexOperationsView
         #if getattr(self, "_in_init_"):
@@ -236,7 +256,35 @@ class Indexable(Nameable, Updateable):
             self.add_index_operation(name, ParameterIndexOperationsView(parent._index_operations[name], offset, self.size))
         self._fixes_ = None
         for p in self.parameters:
-            p._parent_changed(parent)
+            p._parent_changed(self)
+
+    def _children_size_changed(self, index, size):
+        """
+        The children from index on moved by size (size is negative if
+        elements were removed in front of them), because a parameter
+        was inserted or removed.
+
+        As index operation views are relative to their parent, we only need
+        to move the views (and offsets) of the following children and resize
+        our own views.
+        The same then happens for the following siblings of self in the
+        parent, up to the highest parent. The subtrees of all of these do not
+        need to be touched.
+        """
+        from .index_operations import ParameterIndexOperationsView
+        offsets = self.__dict__.get('_parameter_offsets_', None)
+        if offsets is not None:
+            for i in range(index, len(offsets)):
+                offsets[i] += size
+        for p in self.parameters[index:]:
+            for iop in p._index_operations.values():
+                if isinstance(iop, ParameterIndexOperationsView):
+                    iop._offset += size
+        if self.has_parent():
+            for iop in self._index_operations.values():
+                if isinstance(iop, ParameterIndexOperationsView):
+                    iop._size += size
+            self._parent_._children_size_changed(self._parent_index_ + 1, size)
 
     def _add_to_index_operations(self, which, reconstrained, what, warning):
         """
@@ -126,6 +126,17 @@ class ObserverList(object):
             ret.append(curr + ", ".join([frmt(o), str(c)]))
         return '\n'.join(ret)
 
+    def replace(self, observer, new):
+        """
+        Let new take the place of observer, also as the owner of its bound
+        callables (e.g. when a Param gets replaced by a view of new memory).
+        """
+        for i, (p, o, c) in enumerate(self._poc):
+            if o() is observer:
+                if getattr(c, '__self__', None) is observer:
+                    c = c.__func__.__get__(new, type(new))
+                self._poc[i] = (p, weakref.ref(new), c)
+
     def flush(self):
         """
         Make sure all weak references, which point to nothing are flushed (deleted)
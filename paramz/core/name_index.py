@@ -0,0 +1,124 @@
+#===============================================================================
+# Copyright (c) 2015, Max Zwiessele
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of paramz nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#===============================================================================
+import re
+from bisect import bisect_left
+
+from .nameable import adjust_name_for_printing
+
+_special_characters = frozenset('.^$*+?{}[]\\|()')
+
+def _literal_prefix(regexp):
+    """
+    The literal string, which every string matched by the compiled regular
+    expression regexp starts with ('' if it cannot be told easily).
+    """
+    pattern = regexp.pattern
+    if '|' in pattern or regexp.flags & (re.IGNORECASE | re.VERBOSE):
+        return ''
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        c, step = pattern[i], 1
+        if c == '\\':
+            if i + 1 == len(pattern) or pattern[i + 1].isalnum():
+                break # a character class like \d
+            c, step = pattern[i + 1], 2
+        elif c in _special_characters:
+            break
+        quantifier = pattern[i + step:i + step + 1]
+        if quantifier in ('*', '?', '{'):
+            break
+        prefix.append(c)
+        if quantifier == '+':
+            break
+        i += step
+    return ''.join(prefix)
+
+
+class NameIndex(object):
+    """
+    The dotted names of all objects below the root of a hierarchy, as
+    matched by :py:meth:`paramz.parameterized.Parameterized.grep_param_names`
+    (the hierarchy_name without the name of the root).
+
+    The objects are kept in the order traverse visits them, together with
+    the end of their subtree, and the names additionally in sorted order.
+    Thus, a query only matches the names starting with the literal prefix of
+    its pattern, skipping all other subtrees. The result of every pattern
+    is memoized, so that looking up the same names again (e.g.
+    ``m['kern.variance']`` in a loop) costs one dictionary lookup.
+
+    The index is built by the root of the hierarchy and has to be rebuilt,
+    whenever parameters get linked, unlinked or renamed.
+    """
+    def __init__(self, root):
+        self.objects = []
+        self.names = []
+        self.ends = []
+        self._positions = dict()
+        def collect(node, prefix):
+            for p in node.parameters:
+                i = len(self.objects)
+                name = prefix + adjust_name_for_printing(p.name)
+                self._positions[id(p)] = i
+                self.objects.append(p)
+                self.names.append(name)
+                self.ends.append(None)
+                collect(p, name + '.')
+                self.ends[i] = len(self.objects)
+        collect(root, '')
+        self._order = sorted(range(len(self.names)), key=self.names.__getitem__)
+        self._sorted_names = [self.names[i] for i in self._order]
+        self._results = dict()
+
+    def grep(self, regexp, below=None):
+        """
+        The objects with names matching the compiled regular expression
+        regexp, in the order of traversal. If below is given, only the
+        objects in the subtree of below (without below itself) are returned.
+        """
+        key = regexp.pattern, regexp.flags
+        found = self._results.get(key, None)
+        if found is None:
+            prefix = _literal_prefix(regexp)
+            found = []
+            for i in range(bisect_left(self._sorted_names, prefix), len(self._sorted_names)):
+                name = self._sorted_names[i]
+                if not name.startswith(prefix):
+                    break
+                if regexp.match(name):
+                    found.append(self._order[i])
+            found.sort()
+            self._results[key] = found
+        if below is not None:
+            start = self._positions[id(below)]
+            end = self.ends[start]
+            return [self.objects[i] for i in found if start < i < end]
+        return [self.objects[i] for i in found]
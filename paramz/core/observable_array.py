@@ -57,8 +57,11 @@ class ObsAr(np.ndarray, Pickleable, Observable):
         # allways make a copy of input paramters, as we need it to be in C order:
         if not isinstance(input_array, ObsAr):
             try:
-                # try to cast ints to floats
-                obj = np.atleast_1d(np.require(input_array, dtype=np.float_, requirements=['W', 'C'])).view(cls)
+                # try to cast ints to floats, but keep the precision of floats
+                dtype = getattr(input_array, 'dtype', None)
+                if dtype is None or not np.issubdtype(dtype, np.floating):
+                    dtype = np.float64
+                obj = np.atleast_1d(np.require(input_array, dtype=dtype, requirements=['W', 'C'])).view(cls)
             except ValueError:
                 # do we have other dtypes in the array?
                 obj = np.atleast_1d(np.require(input_array, requirements=['W', 'C'])).view(cls)
@@ -108,7 +111,7 @@ class ObsAr(np.ndarray, Pickleable, Observable):
 
     def __reduce__(self):
         func, args, state = super(ObsAr, self).__reduce__()
-        return func, args, (state, Pickleable.__getstate__(self))
+        return func, args, (state, self.__getstate__())
 
     def __setstate__(self, state):
         np.ndarray.__setstate__(self, state[0])
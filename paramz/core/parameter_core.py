@@ -41,6 +41,7 @@ import logging
 from ..transformations import __fixed__, FIXED
 from .constrainable import Constrainable
 from .nameable import adjust_name_for_printing
+from .index_operations import combine_runs, _empty_runs
 from ..caching import FunctionCache
 
 try:
@@ -49,16 +50,124 @@ except:
     RE = RuntimeError
     pass
 
+def _rebind_param(p, values, gradients, shape=None, rebound=None):
+    """
+    Let the Param p use the memory values for its values and gradients for
+    its gradient, in shape (its real shape by default). Returns the Param,
+    which uses the memory from now on.
+
+    numpy does not let an array change its memory, thus the returned Param
+    is a new view of values, which takes over the state of p. It replaces p
+    in its parent, as observer and as attribute of its parents (e.g.
+    self.X = Param('X', ...)). p itself becomes read-only, so that writing
+    to an outdated reference fails instead of getting lost, and linking and
+    unlinking it works on the new Param (see _current_param).
+
+    When rebinding many Params, pass a dict as rebound, to collect the
+    replacements for _replace_attributes instead of going through the
+    attributes of all parents for every Param.
+    """
+    if shape is None:
+        shape = p._realshape_
+    q = values.reshape(shape).view(type(p))
+    d = q.__dict__
+    d.update(p.__dict__)
+    d.pop('_gradient_view_', None)
+    d.pop('_arena_', None)
+    d['_gradient_array_'] = gradients.reshape(shape)
+    meta = p._meta_
+    if meta._original_ is p:
+        meta._original_ = q
+    if meta.observers is not None:
+        meta.observers.replace(p, q)
+    parent = p._parent_
+    if parent is not None and p._parent_index_ is not None:
+        parent.parameters[p._parent_index_] = q
+    p.flags.writeable = False
+    p.__dict__['_outdated_'] = True
+    if rebound is None:
+        # not through _highest_parent_, which would get cached while unpickling:
+        parents = []
+        while parent is not None:
+            parents.append(parent)
+            parent = parent._parent_
+        _replace_attributes(parents, {id(p): q})
+    else:
+        rebound[id(p)] = q
+    return q
+
+def _replace_attributes(nodes, rebound):
+    """
+    Let the attributes of nodes, which are Params replaced by _rebind_param
+    (rebound maps their ids to the new ones), be the new Params.
+    """
+    for node in nodes:
+        d = node.__dict__
+        for name, value in list(d.items()):
+            q = rebound.get(id(value), None)
+            if q is not None:
+                d[name] = q
+        # the name index holds on to the Params as well:
+        d.pop('_name_index_', None)
+
+def _current_param(param):
+    """
+    The Param, which replaced param if it is outdated (see _rebind_param),
+    param itself otherwise.
+    """
+    if getattr(param, '_outdated_', False):
+        return param._original_
+    return param
+
+def _copy_into_arena(p, arena, start, rebound=None):
+    """
+    Copy the values and gradient of the Param p into the arena at start and
+    return the Param using that memory (see _rebind_param). If p got
+    resized, only the elements it had before are copied and the new ones
+    are set to zero.
+    """
+    stop = start + p._realsize_
+    n = min(p.size, p._realsize_)
+    arena[0, start:start + n] = p.values.reshape(-1)[:n]
+    arena[1, start:start + n] = p.gradient_full.reshape(-1)[:n]
+    arena[:, start + n:stop] = 0
+    return _rebind_param(p, arena[0, start:stop], arena[1, start:stop], rebound=rebound)
+
+def _uses_memory(array, memory, start):
+    """
+    Whether array uses the memory of memory from element start on.
+    """
+    return (array.dtype == memory.dtype
+            and array.__array_interface__['data'][0] == memory.__array_interface__['data'][0] + start * memory.itemsize)
+
 class OptimizationHandlable(Constrainable):
     """
     This enables optimization handles on an Object as done in GPy 0.4.
 
     `..._optimizer_copy_transformed`: make sure the transformations and constraints etc are handled
+    `..._optimizer_copy_dirty_`: the parameters, which changed since the last transformation (None for all)
     """
+    #: If more than this fraction of the parameters changed, the whole
+    #: optimizer copy gets transformed, instead of only the changed parameters.
+    _partial_transform_fraction = .25
+    #: If True, transformations with box bounds are not applied, and the
+    #: optimizer has to respect the optimizer_bounds() itself.
+    _native_bounds_ = False
+    #: The dtype of the param_array and gradient of a hierarchy, which has
+    #: this object as highest parent (see set_dtype).
+    _param_dtype_ = np.dtype(np.float64)
+    #: When the arena of a hierarchy has to grow, this fraction of its size
+    #: is reserved in addition, for parameters linked later on.
+    _arena_growth_ = .25
+    #: If less than this fraction of the arena is in use (e.g. after
+    #: unlinking parameters), it gets compacted into a new one.
+    _arena_min_fill_ = .5
+
     def __init__(self, name, default_constraint=None, *a, **kw):
         super(OptimizationHandlable, self).__init__(name, default_constraint=default_constraint, *a, **kw)
         self._optimizer_copy_ = None
         self._optimizer_copy_transformed = False
+        self._optimizer_copy_dirty_ = None
 
     #===========================================================================
     # Optimizer copy
@@ -76,20 +185,36 @@ class OptimizationHandlable(Constrainable):
 
         The optimizer should only interfere with this array, such that transformations
         are secured.
+
+        The returned array is reused (and overwritten) by the next call, copy it
+        if you need to keep the values.
         """
-        if self.__dict__.get('_optimizer_copy_', None) is None or self.size != self._optimizer_copy_.size:
-            self._optimizer_copy_ = np.empty(self.size)
+        x = self._flat_param_array()
+        if (self.__dict__.get('_optimizer_copy_', None) is None or self.size != self._optimizer_copy_.size
+                or x.dtype != self._optimizer_copy_.dtype):
+            self._optimizer_copy_ = np.empty(self.size, dtype=x.dtype)
+            self._optimizer_copy_transformed = False
+            self._optimizer_copy_dirty_ = None
+
+        plan = self._transform_plan()
+        if plan is not self.__dict__.get('_optimizer_copy_plan_', None):
+            # the constraints changed, transform everything:
+            self._optimizer_copy_transformed = False
+            self._optimizer_copy_dirty_ = None
+            self._optimizer_copy_plan_ = plan
 
         if not self._optimizer_copy_transformed:
-            self._optimizer_copy_.flat = self.param_array.flat
-            #py3 fix
-            #[np.put(self._optimizer_copy_, ind, c.finv(self.param_array[ind])) for c, ind in self.constraints.iteritems() if c != __fixed__]
-            [np.put(self._optimizer_copy_, ind, c.finv(self.param_array[ind])) for c, ind in self.constraints.items() if c != __fixed__]
+            dirty = self._optimizer_copy_dirty_runs()
+            if dirty is None:
+                self._optimizer_copy_[:] = x
+                plan.finv(x, self._optimizer_copy_)
+            else:
+                plan.finv_runs(x, self._optimizer_copy_, dirty)
             self._optimizer_copy_transformed = True
+            self._optimizer_copy_dirty_ = dict()
 
-        if self._has_fixes():# or self._has_ties()):
-            self._ensure_fixes()
-            return self._optimizer_copy_[self._fixes_]
+        if plan.free_index is not None:
+            return plan.take_free(self._optimizer_copy_)
         return self._optimizer_copy_
 
     @optimizer_array.setter
@@ -100,29 +225,88 @@ class OptimizationHandlable(Constrainable):
 
         Also we want to update param_array in here.
         """
-        f = None
-        if self.has_parent() and self.constraints[__fixed__].size != 0:
-            f = np.ones(self.size).astype(bool)
-            f[self.constraints[__fixed__]] = FIXED
-        elif self._has_fixes():
-            f = self._fixes_
-        if f is None:
-            self.param_array.flat = p
-            [np.put(self.param_array, ind, c.f(self.param_array.flat[ind]))
-             #py3 fix
-             #for c, ind in self.constraints.iteritems() if c != __fixed__]
-             for c, ind in self.constraints.items() if c != __fixed__]
+        plan = self._transform_plan()
+        x = self._flat_param_array()
+        if plan.free_index is None:
+            x[:] = p
         else:
-            self.param_array.flat[f] = p
-            [np.put(self.param_array, ind[f[ind]], c.f(self.param_array.flat[ind[f[ind]]]))
-             #py3 fix
-             #for c, ind in self.constraints.iteritems() if c != __fixed__]
-             for c, ind in self.constraints.items() if c != __fixed__]
+            x[plan.free_index] = p
+        plan.f(x)
         #self._highest_parent_.tie.propagate_val()
 
         self._optimizer_copy_transformed = False
+        self._optimizer_copy_dirty_ = None
         self.trigger_update()
 
+    def transform_batch(self, X):
+        """
+        Transform a batch of optimizer arrays into the parameter space
+        (see optimizer_array) at once, without changing this handle.
+
+        :param X: array of shape (n, n_free), one optimizer array per row,
+                  where n_free is the size of the optimizer_array.
+        :returns: array of shape (n, self.size), one parameter array per row.
+                  Fixed parameters take their current values.
+        """
+        plan = self._transform_plan()
+        X = np.atleast_2d(X)
+        if X.ndim != 2 or X.shape[1] != plan.size_transformed:
+            raise ValueError("Shape {} does not match the optimizer array size {}".format(X.shape, plan.size_transformed))
+        P = np.empty((X.shape[0], self.size), dtype=self._flat_param_array().dtype)
+        if plan.free_index is None:
+            P[:] = X
+        else:
+            P[:] = self._flat_param_array()
+            P[:, plan.free_index] = X
+        return plan.f(P)
+
+    def untransform_batch(self, P):
+        """
+        Transform a batch of parameter arrays into the space of the optimizer
+        at once, without changing this handle. This is the inverse of
+        transform_batch.
+
+        :param P: array of shape (n, self.size), one parameter array per row.
+        :returns: array of shape (n, n_free), one optimizer array per row,
+                  where n_free is the size of the optimizer_array.
+        """
+        plan = self._transform_plan()
+        P = np.atleast_2d(P)
+        if P.ndim != 2 or P.shape[1] != self.size:
+            raise ValueError("Shape {} does not match the parameter size {}".format(P.shape, self.size))
+        X = plan.finv(P, np.array(P, dtype=self._flat_param_array().dtype))
+        if plan.free_index is not None:
+            return X[:, plan.free_index]
+        return X
+
+    def _transform_plan(self):
+        """
+        The compiled :py:class:`paramz.core.transform_plan.TransformPlan`
+        of the constraints of this handle. It only gets rebuilt, when
+        the constraints (or the structure of the hierarchy) changed.
+        """
+        plan = self.__dict__.get('_transform_plan_', None)
+        dtype = self.param_array.dtype
+        if plan is None or not plan.is_valid_for(self.constraints, self.size, self._native_bounds_, dtype):
+            from .transform_plan import TransformPlan
+            plan = self._transform_plan_ = TransformPlan(self.constraints, self.size, self._native_bounds_, dtype)
+        return plan
+
+    def optimizer_bounds(self):
+        """
+        The (lower, upper) bounds for each entry of the optimizer_array,
+        None meaning unbounded. Only when the transformations are not applied
+        for bounded parameters (_native_bounds_), there are any bounds.
+        """
+        return self._transform_plan().bounds()
+
+    def _flat_param_array(self):
+        """
+        The parameter array as flat numpy array (a view, not a copy), so that
+        setting values in it does not notify any observers.
+        """
+        return self.param_array.view(np.ndarray).reshape(-1)
+
     def _trigger_params_changed(self, trigger_parent=True):
         """
         First tell all children to update,
@@ -145,10 +329,9 @@ class OptimizationHandlable(Constrainable):
         Transform the gradients by multiplying the gradient factor for each
         constraint to it.
         """
-        #py3 fix
-        #[np.put(g, i, c.gradfactor(self.param_array[i], g[i])) for c, i in self.constraints.iteritems() if c != __fixed__]
-        [np.put(g, i, c.gradfactor(self.param_array[i], g[i])) for c, i in self.constraints.items() if c != __fixed__]
-        if self._has_fixes(): return g[self._fixes_]
+        plan = self._transform_plan()
+        plan.gradfactor(self._flat_param_array(), g)
+        if plan.free_index is not None: return g[plan.free_index]
         return g
 
     #def _transform_gradients_non_natural(self, g):
@@ -213,13 +396,14 @@ class OptimizationHandlable(Constrainable):
         for p in self.flattened_parameters:
             name = p.hierarchy_name()
             if p.size > 1:
-                name_list.extend(["{}[{!s}]".format(name, i) for i in p._indices()])
+                name_list.extend(["{}[{}]".format(name, i) for i in p._indices().strings()])
             else:
                 name_list.append(name)
         name_list = np.array(name_list)
 
         if not include_fixed and self._has_fixes():
-            return name_list[self._fixes_]
+            # the names of the entries of the optimizer array:
+            return name_list[self._untransformed_index(np.arange(self._size_transformed()))]
         return name_list
 
     #===========================================================================
@@ -244,7 +428,7 @@ class OptimizationHandlable(Constrainable):
         self.optimizer_array = x  # makes sure all of the tied parameters get the same init (since there's only one prior object...)
         # now draw from prior where possible
         x = self.param_array.copy()
-        unfixlist = np.ones((self.size,),dtype=np.bool)
+        unfixlist = np.ones((self.size,),dtype=bool)
         unfixlist[self.constraints[__fixed__]] = False
         self.param_array.flat[unfixlist] = x.view(np.ndarray).ravel()[unfixlist]
         self.update_model(updates)
@@ -267,34 +451,141 @@ class OptimizationHandlable(Constrainable):
         self.gradient # <<< ensure _gradient_array_
         return self._gradient_array_
 
-    def _propagate_param_grad(self, parray, garray):
+    def _parameter_layout(self):
         """
-        For propagating the param_array and gradient_array.
-        This ensures the in memory view of each subsequent array.
-
-        1.) connect param_array of children to self.param_array
-        2.) tell all children to propagate further
+        The flat layout of all parameters below self, as they are laid out
+        in self.param_array: the lists of (Param, start) for all leaves and
+        of (node, start) for all other objects in the hierarchy.
         """
-        #if self.param_array.size != self.size:
-        #    self._param_array_ = np.empty(self.size, dtype=np.float64)
-        #if self.gradient.size != self.size:
-        #    self._gradient_array_ = np.empty(self.size, dtype=np.float64)
-
-        pi_old_size = 0
-        for pi in self.parameters:
-            pislice = slice(pi_old_size, pi_old_size + pi.size)
-
-            self.param_array[pislice] = pi.param_array.flat  # , requirements=['C', 'W']).flat
-            self.gradient_full[pislice] = pi.gradient_full.flat  # , requirements=['C', 'W']).flat
-
-            pi.param_array.data = parray[pislice].data
-            pi.gradient_full.data = garray[pislice].data
-
-            pi._propagate_param_grad(parray[pislice], garray[pislice])
-            pi_old_size += pi.size
-
+        leaves, nodes = [], []
+        def collect(node, start):
+            for p in node.parameters:
+                if isinstance(p, np.ndarray):
+                    leaves.append((p, start))
+                    # a resized Param gets its new shape in the layout:
+                    start += p._realsize_
+                else:
+                    nodes.append((p, start))
+                    collect(p, start)
+                    start += p.size
+        collect(self, 0)
+        return leaves, nodes
+
+    def _layout_parameters(self):
+        """
+        Lay out the values and gradients of all Params below self in one
+        contiguous arena, of which self.param_array and self.gradient_full
+        are the two rows.
+
+        The layout of the whole tree is computed at once. If the Params
+        already in the arena only have to move into one direction (e.g.
+        after inserting or resizing parameters), they get moved inside of it
+        block by block and only new Params get copied in. Otherwise, or if
+        the arena is too small or mostly unused, one new arena gets
+        allocated and every Param gets copied into it once. Params, which
+        have to use new memory, get replaced by views of the arena in the
+        hierarchy (see _rebind_param). All other objects in the hierarchy
+        only get views into the arena, so that nothing is copied level by
+        level.
+
+        The arena belongs to the highest parent, thus laying out an inner
+        node of a hierarchy lays out the whole hierarchy.
+        """
+        # not through _highest_parent_, which would get cached while unpickling:
+        root = self
+        while root._parent_ is not None:
+            root = root._parent_
+        if root is not self and '_arena_' in root.__dict__:
+            return root._layout_parameters()
+        leaves, nodes = self._parameter_layout()
+        rebound = {}
+        size = self.size
+        parray = self.__dict__.get('_param_array_', None)
+        arena = self.__dict__.get('_arena_', None)
+        if self._parent_ is None or parray is None:
+            dtype = self._param_dtype_
+        else:
+            dtype = parray.dtype
+        if (arena is None or parray is None or parray.base is not arena or arena.dtype != dtype
+                or size > arena.shape[1] or size < arena.shape[1] * self._arena_min_fill_
+                or not self._move_in_arena(arena, leaves, rebound)):
+            capacity = size
+            if arena is not None and size > arena.shape[1]:
+                # growing: leave room for more parameters to come
+                capacity += int(size * self._arena_growth_)
+            arena = np.empty((2, capacity), dtype=dtype)
+            for p, start in leaves:
+                _copy_into_arena(p, arena, start, rebound)
+            self.__dict__['_arena_'] = arena
+        if rebound:
+            _replace_attributes([self] + [node for node, _ in nodes], rebound)
+        if parray is None or parray.base is not arena or parray.size != size:
+            self._param_array_, self._gradient_array_ = arena[0, :size], arena[1, :size]
+        parray, garray = self._param_array_, self._gradient_array_
+        for node, start in nodes:
+            node.__dict__.pop('_arena_', None)
+            a = node.__dict__.get('_param_array_', None)
+            if a is None or a.size != node.size or not _uses_memory(a, parray, start):
+                node._param_array_ = parray[start:start + node.size]
+                node._gradient_array_ = garray[start:start + node.size]
+            node._model_initialized_ = True
         self._model_initialized_ = True
 
+    def _move_in_arena(self, arena, leaves, rebound=None):
+        """
+        Move the Params in leaves, which are inside of arena already, to
+        their start in place and copy all others into it.
+
+        This is only possible, if the Params keep their order and all move
+        into the same direction, so that no block gets overwritten before it
+        was moved. Returns False (having changed nothing) otherwise. Resized
+        Params (see :py:meth:`paramz.param.Param.resize`) keep the elements
+        they had before in place and get the new ones set to zero.
+        """
+        values, gradients = arena
+        base, itemsize = values.__array_interface__['data'][0], arena.itemsize
+        moved, new = [], []
+        direction, last = 0, 0
+        for p, start in leaves:
+            offset, rest = divmod(p.__array_interface__['data'][0] - base, itemsize)
+            if (rest or p.dtype != arena.dtype or not 0 <= offset <= values.size - p.size
+                    or not _uses_memory(p.gradient_full, gradients, offset)):
+                if np.may_share_memory(p, arena):
+                    # it could get overwritten, before it is copied
+                    return False
+                new.append((p, start))
+                continue
+            if offset < last:
+                return False
+            last = offset + p.size
+            delta = start - offset
+            if delta:
+                if direction * delta < 0:
+                    return False
+                direction = delta
+            if delta or p.size != p._realsize_:
+                moved.append((p, offset, start))
+        blocks = []
+        for p, offset, start in moved:
+            end = offset + min(p.size, p._realsize_)
+            if start == offset:
+                continue
+            if blocks and blocks[-1][1] == offset and blocks[-1][2] == start - offset:
+                blocks[-1][1] = end
+            else:
+                blocks.append([offset, end, start - offset])
+        if direction > 0:
+            blocks.reverse()
+        for a, b, delta in blocks:
+            arena[:, a + delta:b + delta] = arena[:, a:b]
+        for p, _, start in moved:
+            stop = start + p._realsize_
+            arena[:, start + min(p.size, p._realsize_):stop] = 0
+            _rebind_param(p, values[start:stop], gradients[start:stop], rebound=rebound)
+        for p, start in new:
+            _copy_into_arena(p, arena, start, rebound)
+        return True
+
     def _connect_parameters(self):
         pass
 
@@ -346,9 +637,27 @@ class Parameterizable(OptimizationHandlable):
         m.param_array[:] = m_copy.param_array
         """
         if (self.__dict__.get('_param_array_', None) is None) or (self._param_array_.size != self.size):
-            self._param_array_ = np.empty(self.size, dtype=np.float64)
+            self._param_array_ = np.empty(self.size, dtype=self._param_dtype_)
         return self._param_array_
 
+    def set_dtype(self, dtype):
+        """
+        Set the dtype (e.g. np.float32) of the param_array and gradient of
+        the whole hierarchy this object is in, and convert all parameters
+        to it. Parameters linked later on get converted as well.
+
+        The transformations are computed in this precision, the optimizer
+        gets to see float64 arrays (see :py:class:`paramz.model.Model`).
+        The Params get replaced by Params in the new dtype, thus get them
+        through the hierarchy (e.g. m.X) afterwards.
+        """
+        root = self._highest_parent_
+        if isinstance(root, np.ndarray):
+            raise ValueError("A Param on its own cannot change its dtype, create it from an array of the dtype or set the dtype of its hierarchy")
+        root._param_dtype_ = np.dtype(dtype)
+        root._layout_parameters()
+        root.trigger_update()
+
     @property
     def unfixed_param_array(self):
         """
@@ -391,6 +700,11 @@ class Parameterizable(OptimizationHandlable):
         for c in self.parameters:
             c.traverse(visit, *args, **kwargs)
 
+    def _highest_parent_changed(self):
+        super(Parameterizable, self)._highest_parent_changed()
+        for c in self.parameters:
+            c._highest_parent_changed()
+
 
     def traverse_parents(self, visit, *args, **kwargs):
         """
@@ -430,7 +744,7 @@ class Parameterizable(OptimizationHandlable):
     @property
     def gradient(self):
         if (self.__dict__.get('_gradient_array_', None) is None) or self._gradient_array_.size != self.size:
-            self._gradient_array_ = np.empty(self.size, dtype=np.float64)
+            self._gradient_array_ = np.empty(self.size, dtype=self._param_dtype_)
         return self._gradient_array_
 
     @gradient.setter
@@ -441,7 +755,21 @@ class Parameterizable(OptimizationHandlable):
     def num_params(self):
         return len(self.parameters)
 
-    def _add_parameter_name(self, param):
+    def _has_attribute_name(self, name):
+        """
+        Whether name is an attribute of self (or its class), as in dir(self),
+        but without building the whole list of attribute names.
+        """
+        return name in self.__dict__ or any(name in vars(c) for c in type(self).__mro__)
+
+    def _add_parameter_name(self, param, unique_names=None):
+        """
+        Make param accessible as attribute of self under its (printing) name,
+        renaming parameters with the same name.
+
+        :param set unique_names: names known to be used by only one child,
+                                 to skip the search for duplicates.
+        """
         try:
             pname = adjust_name_for_printing(param.name)
     
@@ -461,10 +789,11 @@ class Parameterizable(OptimizationHandlable):
                     param.name = match.group('name') + "_" + str(int(match.group('digit'))+1)
                 self._add_parameter_name(param)
             # and makes sure to not delete programmatically added parameters
-            for other in self.parameters:
-                if (not (other is param)) and (other.name == param.name):
-                    return warn_and_retry(other, _name_digit.match(other.name))
-            if pname not in dir(self):
+            if unique_names is None or param.name not in unique_names:
+                for other in self.parameters:
+                    if (not (other is param)) and (other.name == param.name):
+                        return warn_and_retry(other, _name_digit.match(other.name))
+            if not self._has_attribute_name(pname):
                 self.__dict__[pname] = param
                 self._added_names_.add(pname)
             else: # pname in self.__dict__
@@ -481,16 +810,33 @@ class Parameterizable(OptimizationHandlable):
 
     def _remove_parameter_name(self, param=None, pname=None):
         assert param is None or pname is None, "can only delete either param by name, or the name of a param"
-        pname = adjust_name_for_printing(pname) or adjust_name_for_printing(param.name)
+        self._drop_parameter_name(pname or param.name)
+        self._connect_parameters()
+
+    def _drop_parameter_name(self, name):
+        """
+        Remove the attribute added for a parameter called name, without
+        connecting the parameters again.
+        """
+        self.__dict__.pop('_parameter_name_index_', None)
+        pname = adjust_name_for_printing(name)
         if pname in self._added_names_:
             del self.__dict__[pname]
             self._added_names_.remove(pname)
-        self._connect_parameters()
 
     def _name_changed(self, param, old_name):
+        self._name_index_changed()
         self._remove_parameter_name(None, old_name)
         self._add_parameter_name(param)
 
+    def _name_index_changed(self):
+        """
+        The names of the hierarchy self is in changed, so that the name
+        index of its highest parent (see Parameterized._name_index) has to be
+        built again.
+        """
+        self._highest_parent_.__dict__.pop('_name_index_', None)
+
     def __setstate__(self, state):
         super(Parameterizable, self).__setstate__(state)
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -504,8 +850,39 @@ class Parameterizable(OptimizationHandlable):
         In parameterizable we just need to make sure, that the next call to optimizer_array
         will update the optimizer_array to the latest parameters
         """
-        self._optimizer_copy_transformed = False # tells the optimizer array to update on next request
+        self._optimizer_copy_changed(which) # tells the optimizer array to update on next request
         self.parameters_changed()
+
+    def _optimizer_copy_changed(self, which=None):
+        """
+        Record that the parameters of `which` changed, so that only those
+        need to be transformed for the next optimizer_array request.
+        If `which` is not a part of this handle, everything changed.
+        """
+        dirty = self.__dict__.get('_optimizer_copy_dirty_', None)
+        parent = getattr(which, '_parent_', None)
+        while parent is not None and parent is not self:
+            parent = parent._parent_
+        if dirty is None or parent is None:
+            self._optimizer_copy_dirty_ = None
+        else:
+            original = which._parent_._get_original(which)
+            dirty[id(original)] = original
+        self._optimizer_copy_transformed = False
+
+    def _optimizer_copy_dirty_runs(self):
+        """
+        The runs of the optimizer copy, which are out of date, or None if
+        (more than _partial_transform_fraction of) everything is.
+        """
+        dirty = self.__dict__.get('_optimizer_copy_dirty_', None)
+        if dirty is None or sum(p.size for p in dirty.values()) > self._partial_transform_fraction * self.size:
+            return None
+        runs = _empty_runs()
+        for p in dirty.values():
+            start = self._offset_for(p)
+            runs = combine_runs(runs, np.array([[start, start + p.size]], dtype=int))
+        return runs
     def _pass_through_notify_observers(self, me, which=None):
         self.notify_observers(which=which)
     def _setup_observers(self):
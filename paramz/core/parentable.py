@@ -63,10 +63,25 @@ class Parentable(object):
     def _highest_parent_(self):
         """
         Gets the highest parent by traversing up to the root node of the hierarchy.
+
+        The root is cached on every node on the way, and the cache gets
+        dropped when reparenting (see :py:meth:`_highest_parent_changed`).
+        """
+        root = self.__dict__.get('_root_', None)
+        if root is None:
+            if self._parent_ is None:
+                return self
+            root = self._parent_._highest_parent_
+            # set directly, as Parameterized.__setattr__ checks the parameter names:
+            self.__dict__['_root_'] = root
+        return root
+
+    def _highest_parent_changed(self):
+        """
+        Drop the cached highest parent of this object and all of its
+        children, as it was (dis)connected from a parent.
         """
-        if self._parent_ is None:
-            return self
-        return self._parent_._highest_parent_
+        self.__dict__.pop('_root_', None)
 
     def _notify_parent_change(self):
         """
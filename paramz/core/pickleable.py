@@ -103,11 +103,23 @@ class Pickleable(object):
 
     def __getstate__(self):
         ignore_list = ['_param_array_', # parameters get set from bottom to top
+                       '_arena_',
                        '_gradient_array_', # as well as gradients
+                       '_gradient_view_',
+                       '_meta_', # Params add their metadata themselves
                        '_optimizer_copy_',
+                       '_transform_plan_', # gets rebuilt from the constraints
+                       '_optimizer_copy_plan_',
+                       '_optimizer_copy_dirty_',
+                       '_parameter_name_index_', # gets rebuilt from the names
+                       '_name_index_',
+                       '_parameter_offsets_', # and from the sizes
+                       '_root_', # the highest parent gets looked up again
+                       '_raveled_index_',
                        'logger',
                        'observers',
                        '_fixes_', # and fixes
+                       '_transformed_index_map_',
                        'cache', # never pickle the cache
                        ]
         dc = dict()
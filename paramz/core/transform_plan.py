@@ -0,0 +1,218 @@
+#===============================================================================
+# Copyright (c) 2015, Max Zwiessele
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of paramz nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#===============================================================================
+import numpy as np
+
+from ..transformations import __fixed__
+from .index_operations import remove_runs, runs_to_index, _empty_runs
+
+
+def _runs_to_indexer(runs):
+    """
+    A single run is a contiguous block and can be indexed by a slice
+    (which gives views instead of copies), everything else needs an integer
+    gather/scatter array.
+    """
+    if runs.shape[0] == 1:
+        return slice(int(runs[0, 0]), int(runs[0, 1]))
+    return runs_to_index(runs)
+
+
+class TransformPlan(object):
+    """
+    The compiled transformations of a parameter handle.
+
+    The constraints are grouped by transformation into slices (contiguous
+    blocks) or index arrays, fixed elements already removed. Additionally,
+    the indices of the free (not fixed) elements are stored, or None if
+    nothing is fixed.
+
+    The plan is built once from the constraints and stays valid, until the
+    constraints change (see :py:meth:`is_valid_for`).
+
+    With native_bounds, transformations which have box bounds (see
+    :py:meth:`paramz.transformations.Transformation.bounds`) are not applied,
+    but collected into `bounded`, so that an optimizer can handle their
+    bounds directly on the untransformed parameters.
+    """
+    def __init__(self, constraints, size, native_bounds=False, dtype=np.float64):
+        self._constraints = constraints
+        self.dtype = np.dtype(dtype)
+        self._key = (constraints._version, constraints._offset, size, native_bounds, self.dtype)
+        self.size = size
+
+        run_items = dict(constraints._run_items())
+        fixed = run_items.pop(__fixed__, _empty_runs())
+        if fixed.shape[0] > 0:
+            free = np.ones(size, dtype=bool)
+            free[runs_to_index(fixed)] = False
+            self.free_index = np.flatnonzero(free)
+        else:
+            self.free_index = None
+
+        self.transforms = []
+        self.bounded = []
+        for c, runs in run_items.items():
+            runs = remove_runs(runs, fixed)
+            if runs.shape[0] > 0:
+                if native_bounds and c.bounds() is not None:
+                    self.bounded.append((c, _runs_to_indexer(runs)))
+                else:
+                    self.transforms.append((c, _runs_to_indexer(runs)))
+        self._buffers_ = [None] * len(self.transforms)
+        self._free_buffer_ = None
+
+    def is_valid_for(self, constraints, size, native_bounds=False, dtype=np.float64):
+        """
+        Whether this plan still represents the given constraints (and the
+        buffers are of the given dtype).
+        """
+        return (constraints is self._constraints
+                and self._key == (constraints._version, constraints._offset, size, native_bounds, np.dtype(dtype)))
+
+    def bounds(self):
+        """
+        The (lower, upper) bounds for each free parameter, None meaning
+        unbounded, as used by e.g. scipy.optimize.fmin_l_bfgs_b.
+        """
+        lower = np.full(self.size, -np.inf)
+        upper = np.full(self.size, np.inf)
+        for c, ind in self.bounded:
+            l, u = c.bounds()
+            if l is not None: lower[ind] = l
+            if u is not None: upper[ind] = u
+        if self.free_index is not None:
+            lower, upper = lower[self.free_index], upper[self.free_index]
+        return [(None if np.isinf(l) else l, None if np.isinf(u) else u) for l, u in zip(lower, upper)]
+
+    @property
+    def size_transformed(self):
+        if self.free_index is None:
+            return self.size
+        return self.free_index.size
+
+    def take_free(self, x):
+        """
+        Gather the free elements of x into a preallocated buffer and return
+        it. The buffer is reused for every call, so the result gets
+        overwritten by the next call.
+        """
+        if self._free_buffer_ is None:
+            self._free_buffer_ = np.empty(self.free_index.size, dtype=self.dtype)
+        # the indices are always in range, and with mode='raise' numpy
+        # would gather into a temporary copy first:
+        return np.take(x, self.free_index, out=self._free_buffer_, mode='clip')
+
+    def _buffers(self, i):
+        """
+        Return the preallocated (gather buffer, gradient gather buffer,
+        workspace) for the i-th transformation. The gather buffers are None
+        for slices, as those can be transformed in place.
+        """
+        buffers = self._buffers_[i]
+        if buffers is None:
+            ind = self.transforms[i][1]
+            if isinstance(ind, slice):
+                buffers = None, None, np.empty(ind.stop - ind.start, dtype=self.dtype)
+            else:
+                buffers = tuple(np.empty(ind.size, dtype=self.dtype) for _ in range(3))
+            self._buffers_[i] = buffers
+        return buffers
+
+    def _apply(self, name, x, out, g=None):
+        """
+        Apply the transformation `name` of each constraint to x[ind] and
+        write the result into out[ind]. For gradfactor, g is the gradient,
+        which will be multiplied in.
+
+        If x is two dimensional, each row is one parameter vector.
+        """
+        batch = x.ndim > 1
+        for i, (c, ind) in enumerate(self.transforms):
+            method = getattr(c, name)
+            if batch or not c.supports_out():
+                if batch:
+                    # the parameters are in the last dimension:
+                    ind = (Ellipsis, ind)
+                args = (x[ind],) if g is None else (x[ind], g[ind])
+                out[ind] = method(*args)
+                continue
+            gather, gather_g, workspace = self._buffers(i)
+            if gather is None:
+                args = (x[ind],) if g is None else (x[ind], g[ind])
+                method(*args, out=out[ind], workspace=workspace)
+            else:
+                # gather into the preallocated buffers, to not allocate
+                # temporaries for the fancy indexing:
+                args = (np.take(x, ind, out=gather, mode='clip'),)
+                if g is not None:
+                    args += (np.take(g, ind, out=gather_g, mode='clip'),)
+                method(*args, out=args[-1], workspace=workspace)
+                np.put(out, ind, args[-1], mode='clip')
+        return out
+
+    def finv(self, x, out):
+        """
+        Transform the model space array x into the optimizer space array out.
+        Elements without a transformation have to be set in out already.
+        """
+        return self._apply('finv', x, out)
+
+    def finv_runs(self, x, out, runs):
+        """
+        As finv, but only for the elements in the given runs (see
+        :py:mod:`paramz.core.index_operations`), including copying the
+        elements without transformation.
+        """
+        for start, stop in runs:
+            out[start:stop] = x[start:stop]
+            for c, ind in self.transforms:
+                if isinstance(ind, slice):
+                    ind = slice(max(start, ind.start), min(stop, ind.stop))
+                    if ind.start >= ind.stop:
+                        continue
+                else:
+                    ind = ind[np.searchsorted(ind, start):np.searchsorted(ind, stop)]
+                    if ind.size == 0:
+                        continue
+                out[ind] = c.finv(x[ind])
+        return out
+
+    def f(self, x):
+        """
+        Transform the optimizer space array x into model space, in place.
+        """
+        return self._apply('f', x, x)
+
+    def gradfactor(self, x, g):
+        """
+        Multiply the gradient factors of the model space array x to the
+        gradient g, in place.
+        """
+        return self._apply('gradfactor', x, g, g)
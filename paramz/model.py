@@ -33,7 +33,7 @@
 
 
 import numpy as np
-from numpy.linalg.linalg import LinAlgError
+from numpy.linalg import LinAlgError
 
 from . import optimization
 from .parameterized import Parameterized
@@ -62,7 +62,7 @@ class Model(Parameterized):
         self.obj_grads = None
         #self.add_observer(self.tie, self.tie._parameters_changed_notification, priority=-500)
 
-    def optimize(self, optimizer=None, start=None, messages=False, max_iters=1000, ipython_notebook=True, clear_after_finish=False, **kwargs):
+    def optimize(self, optimizer=None, start=None, messages=False, max_iters=1000, ipython_notebook=True, clear_after_finish=False, native_bounds=False, **kwargs):
         """
         Optimize the model using self.log_likelihood and self.log_likelihood_gradient, as well as self.priors.
 
@@ -84,6 +84,10 @@ class Model(Parameterized):
           - 'lbfgs': the bfgs method (see scipy.optimize.fmin_bfgs),
           - 'sgd': stochastic gradient decsent (see scipy.optimize.sgd). For experts only!
 
+        :param bool native_bounds: if the optimizer supports box bounds
+            (e.g. 'lbfgsb', 'tnc'), bounded and positive/negative constraints are
+            passed to it as bounds, instead of transforming the parameters.
+            start then has to be given in the untransformed space for those.
 
         """
         if self.is_fixed or self.size == 0:
@@ -94,9 +98,6 @@ class Model(Parameterized):
             print("updates were off, setting updates on again")
             self.update_model(True)
 
-        if start is None:
-            start = self.optimizer_array
-
         if optimizer is None:
             optimizer = self.preferred_optimizer
 
@@ -107,10 +108,25 @@ class Model(Parameterized):
             optimizer = optimization.get_optimizer(optimizer)
             opt = optimizer(max_iters=max_iters, **kwargs)
 
-        with VerboseOptimization(self, opt, maxiters=max_iters, verbose=messages, ipython_notebook=ipython_notebook, clear_after_finish=clear_after_finish) as vo:
-            opt.run(start, f_fp=self._objective_grads, f=self._objective, fp=self._grads)
+        native_bounds = native_bounds and opt.supports_bounds
+        self._native_bounds_ = native_bounds
+        try:
+            if native_bounds:
+                opt.bounds = self.optimizer_bounds()
+
+            if start is None:
+                # the optimizers expect float64, whatever the dtype of the model:
+                start = np.array(self.optimizer_array, dtype=np.float64)
 
-        self.optimizer_array = opt.x_opt
+            with VerboseOptimization(self, opt, maxiters=max_iters, verbose=messages, ipython_notebook=ipython_notebook, clear_after_finish=clear_after_finish) as vo:
+                opt.run(start, f_fp=self._objective_grads, f=self._objective, fp=self._grads)
+
+            self.optimizer_array = opt.x_opt
+        finally:
+            self._native_bounds_ = False
+        if native_bounds:
+            # x_opt in the space of the (transformed) optimizer_array again:
+            opt.x_opt = self.optimizer_array.copy()
 
         self.optimization_runs.append(opt)
         return opt
@@ -222,6 +238,14 @@ class Model(Parameterized):
         """
         return self.gradient
 
+    def _optimizer_gradients(self):
+        """
+        The gradients of the objective in the space of the optimizer, as
+        float64 array (scipy's optimizers require double precision, even if
+        the model computes in single precision, see set_dtype).
+        """
+        return np.asarray(self._transform_gradients(self.objective_function_gradients()), dtype=np.float64)
+
     def _grads(self, x):
         """
         Gets the gradients from the likelihood and the priors.
@@ -236,13 +260,13 @@ class Model(Parameterized):
         try:
             # self._set_params_transformed(x)
             self.optimizer_array = x
-            self.obj_grads = self._transform_gradients(self.objective_function_gradients())
+            self.obj_grads = self._optimizer_gradients()
             self._fail_count = 0
         except (LinAlgError, ZeroDivisionError, ValueError): #pragma: no cover
             if self._fail_count >= self._allowed_failures:
                 raise
             self._fail_count += 1
-            self.obj_grads = np.clip(self._transform_gradients(self.objective_function_gradients()), -1e100, 1e100)
+            self.obj_grads = np.clip(self._optimizer_gradients(), -1e100, 1e100)
         return self.obj_grads
 
     def _objective(self, x):
@@ -271,17 +295,17 @@ class Model(Parameterized):
     def _objective_grads(self, x):
         try:
             self.optimizer_array = x
-            obj_f, self.obj_grads = self.objective_function(), self._transform_gradients(self.objective_function_gradients())
+            obj_f, self.obj_grads = self.objective_function(), self._optimizer_gradients()
             self._fail_count = 0
         except (LinAlgError, ZeroDivisionError, ValueError):#pragma: no cover
             if self._fail_count >= self._allowed_failures:
                 raise
             self._fail_count += 1
             obj_f = np.inf
-            self.obj_grads = np.clip(self._transform_gradients(self.objective_function_gradients()), -1e10, 1e10)
+            self.obj_grads = np.clip(self._optimizer_gradients(), -1e10, 1e10)
         return obj_f, self.obj_grads
 
-    def _checkgrad(self, target_param=None, verbose=False, step=1e-6, tolerance=1e-3, df_tolerance=1e-12):
+    def _checkgrad(self, target_param=None, verbose=False, step=None, tolerance=1e-3, df_tolerance=1e-12):
         """
         Check the gradient of the ,odel by comparing to a numerical
         estimate.  If the verbose flag is passed, individual
@@ -290,7 +314,7 @@ class Model(Parameterized):
         :param verbose: If True, print a "full" checking of each parameter
         :type verbose: bool
         :param step: The size of the step around which to linearise the objective
-        :type step: float (default 1e-6)
+        :type step: float (default 1e-6 for float64, scaled to the resolution of the model's dtype otherwise)
         :param tolerance: the tolerance allowed (see note)
         :type tolerance: float (default 1e-3)
 
@@ -308,6 +332,10 @@ class Model(Parameterized):
             return False
 
         x = self.optimizer_array.copy()
+        if step is None:
+            # 1e-6 is lost in the rounding of e.g. float32 parameters
+            eps = np.finfo(self.param_array.dtype).eps
+            step = 1e-6 * (eps / np.finfo(np.float64).eps) ** (1. / 3)
 
         if not verbose:
             # make sure only to test the selected parameters
@@ -426,7 +454,7 @@ class Model(Parameterized):
         to_print.append(super(Model, self)._repr_html_())
         return "\n".join(to_print)
 
-    def __str__(self, VT100=True):
+    def _str_lines(self, header=True, VT100=True):
         model_details = [['Name', self.name],
                          ['Objective', '{}'.format(float(self.objective_function()))],
                          ["Number of Parameters", '{}'.format(self.size)],
@@ -434,7 +462,13 @@ class Model(Parameterized):
                          ["Updates", '{}'.format(self._update_on)],
                          ]
         max_len = max(map(len, model_details))
-        to_print = [""] + ["{0:{l}} : {1}".format(name, detail, l=max_len) for name, detail in model_details] + ["Parameters:"]
-        to_print.append(super(Model, self).__str__(VT100=VT100))
-        return "\n".join(to_print)
+        yield ""
+        for name, detail in model_details:
+            yield "{0:{l}} : {1}".format(name, detail, l=max_len)
+        yield "Parameters:"
+        for line in super(Model, self)._str_lines(header, VT100):
+            yield line
+
+    def __str__(self, VT100=True):
+        return "\n".join(self._str_lines(VT100=VT100))
 
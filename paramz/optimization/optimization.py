@@ -26,7 +26,13 @@ class Optimizer(object):
 
     :rtype: optimizer object.
 
+    Optimizers, which can handle box bounds (supports_bounds), respect the
+    `bounds` attribute: a list of (lower, upper) per parameter, None meaning
+    unbounded.
+
     """
+    supports_bounds = False
+
     def __init__(self, messages=False, max_f_eval=1e4, max_iters=1e3,
                  ftol=None, gtol=None, xtol=None, bfgs_factor=None):
         self.opt_name = None
@@ -45,6 +51,7 @@ class Optimizer(object):
         self.xtol = xtol
         self.gtol = gtol
         self.ftol = ftol
+        self.bounds = None
 
     def run(self, x_init, **kwargs):
         start = dt.datetime.now()
@@ -68,6 +75,8 @@ class Optimizer(object):
 
 
 class opt_tnc(Optimizer):
+    supports_bounds = True
+
     def __init__(self, *args, **kwargs):
         Optimizer.__init__(self, *args, **kwargs)
         self.opt_name = "TNC (Scipy implementation)"
@@ -89,6 +98,8 @@ class opt_tnc(Optimizer):
             opt_dict['ftol'] = self.ftol
         if self.gtol is not None:
             opt_dict['pgtol'] = self.gtol
+        if self.bounds is not None:
+            opt_dict['bounds'] = self.bounds
 
         opt_result = optimize.fmin_tnc(f_fp, x_init, messages=self.messages,
                        maxfun=self.max_f_eval, **opt_dict)
@@ -98,6 +109,8 @@ class opt_tnc(Optimizer):
         self.status = tnc_rcstrings[opt_result[2]]
 
 class opt_lbfgsb(Optimizer):
+    supports_bounds = True
+
     def __init__(self, *args, **kwargs):
         Optimizer.__init__(self, *args, **kwargs)
         self.opt_name = "L-BFGS-B (Scipy implementation)"
@@ -120,6 +133,8 @@ class opt_lbfgsb(Optimizer):
             opt_dict['pgtol'] = self.gtol
         if self.bfgs_factor is not None:
             opt_dict['factr'] = self.bfgs_factor
+        if self.bounds is not None:
+            opt_dict['bounds'] = self.bounds
 
         opt_result = optimize.fmin_l_bfgs_b(f_fp, x_init, maxfun=self.max_iters, maxiter=self.max_iters, **opt_dict)
         self.x_opt = opt_result[0]
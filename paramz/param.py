@@ -34,6 +34,9 @@ from .core.observable_array import ObsAr
 from .core.pickleable import Pickleable
 from functools import reduce
 from collections import OrderedDict
+from operator import attrgetter
+from .transformations import __fixed__, Logexp, NegativeLogexp, Logistic
+from .core.index_operations import runs_size
 
 ###### printing
 #__constraints_name__ = "Constraint"
@@ -45,8 +48,123 @@ except:
 #__tie_name__ = "Tied to"
 #__priors_name__ = "Prior"
 __print_threshold__ = 5
+try: # readthedocs weirdness
+    __print_summary_size__ = np.get_printoptions()['threshold'] # summarize larger params, like numpy does
+except:
+    __print_summary_size__ = 1000
 ######
 
+def _is_full_slice(slice_index, shape):
+    """
+    Whether slice_index selects all elements of an array of the given shape
+    in their original order.
+    """
+    return (len(slice_index) <= len(shape)
+            and all(isinstance(s, slice) and s.indices(n) == (0, n, 1) for s, n in zip(slice_index, shape)))
+
+def _selected_coordinates(shape, slice_index):
+    """
+    Generate the coordinates along each dimension of the elements of an
+    array of the given shape, which are selected by slice_index. The index
+    grids get broadcast instead of allocated, so that only memory for the
+    selected elements is needed.
+    """
+    for d, n in enumerate(shape):
+        grid = np.arange(n).reshape((n,) + (1,) * (len(shape) - d - 1))
+        yield np.ravel(np.broadcast_to(grid, shape)[slice_index])
+
+class SelectedIndices(object):
+    """
+    The multi-indices of the elements of an array of the given shape, which
+    are selected by slice_index, in the order of the raveled selection.
+
+    The coordinates of only the selected elements get generated, on first
+    use, so that looking at a small slice of a huge Param does not allocate
+    index grids of the whole parameter. Each multi-index is an int array of
+    the coordinates, :py:meth:`strings` formats all of them at once.
+    """
+    def __init__(self, shape, slice_index):
+        self._shape = shape
+        self._slice_index = slice_index
+        self._coordinates = None
+
+    @property
+    def coordinates(self):
+        """
+        The (ndim, number of selected elements) array of the coordinates.
+        """
+        if self._coordinates is None:
+            coordinates = list(_selected_coordinates(self._shape, self._slice_index))
+            self._coordinates = np.array(coordinates, dtype=int).reshape(len(self._shape), -1)
+        return self._coordinates
+
+    def __len__(self):
+        return self.coordinates.shape[1]
+
+    def __getitem__(self, i):
+        return self.coordinates[:, i]
+
+    def __iter__(self):
+        return iter(self.coordinates.T)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.coordinates.T, dtype=dtype)
+
+    def strings(self, rows=None):
+        """
+        The list of the multi-indices (of the given rows only, if not None)
+        formatted as numpy prints them, e.g. '[10  2]'.
+        """
+        coordinates = self.coordinates
+        if rows is not None:
+            coordinates = coordinates[:, rows]
+        if coordinates.shape[1] == 0:
+            return []
+        # numpy pads all coordinates of one index to the same width:
+        digits = np.floor(np.log10(np.maximum(np.abs(coordinates), 1))).astype(int) + 1 + (coordinates < 0)
+        template = '[' + ' '.join('{{{}:>{{w}}}}'.format(d) for d in range(coordinates.shape[0])) + ']'
+        return [template.format(*c, w=w) for c, w in zip(coordinates.T.tolist(), digits.max(0).tolist())]
+
+class ParamMetadata(object):
+    """
+    The metadata of a Param, which is shared by the Param and all views and
+    slices of it.
+
+    Every numpy view of a Param (e.g. ``p[0]`` or ``p.T``) runs
+    :py:meth:`Param.__array_finalize__`. Instead of copying each attribute
+    into the new view, the view only gets a pointer to this record, which
+    keeps slicing Params in model code cheap. The record is the
+    same object for all views, thus they always agree with the Param about
+    e.g. its parent, name or constraints.
+    """
+    __slots__ = ('_parent_', '_parent_index_', '_default_constraint_',
+                 '_realshape_', '_realsize_', '_realndim_', '_original_',
+                 '_name', '_update_on', '_index_operations', 'observers')
+    # observers are not part of the state, they get set up on unpickling:
+    _state_ = __slots__[:-1]
+
+    def __init__(self):
+        for name in self.__slots__:
+            # _index_operations stays unset, so that old pickles can be detected
+            if name != '_index_operations':
+                setattr(self, name, None)
+
+    def __getstate__(self):
+        return dict((name, getattr(self, name)) for name in self._state_ if hasattr(self, name))
+
+    def __setstate__(self, state):
+        self.__init__()
+        for name, value in state.items():
+            setattr(self, name, value)
+
+def _metadata_property(name):
+    """
+    A property for the attribute name of the shared :py:class:`ParamMetadata`.
+    """
+    def fset(self, value):
+        setattr(self._meta_, name, value)
+    return property(attrgetter('_meta_.' + name), fset)
+
 class Param(Parameterizable, ObsAr):
     """
     Parameter object for GPy models.
@@ -82,10 +200,10 @@ class Param(Parameterizable, ObsAr):
 
     """
     __array_priority__ = -1 # Never give back Param
-    _fixes_ = None
     parameters = []
     def __new__(cls, name, input_array, default_constraint=None):
         obj = super(Param, cls).__new__(cls, input_array=input_array)
+        obj._meta_ = ParamMetadata()
         obj._current_slice_ = (slice(obj.shape[0]),)
         obj._realshape_ = obj.shape
         obj._realsize_ = obj.size
@@ -98,28 +216,33 @@ class Param(Parameterizable, ObsAr):
         super(Param, self).__init__(name=name, default_constraint=default_constraint, *a, **kw)
         self._in_init_ = False
 
+    # The attributes shared by all views of this Param (see ParamMetadata):
+    _parent_ = _metadata_property('_parent_')
+    _parent_index_ = _metadata_property('_parent_index_')
+    _default_constraint_ = _metadata_property('_default_constraint_')
+    _realshape_ = _metadata_property('_realshape_')
+    _realsize_ = _metadata_property('_realsize_')
+    _realndim_ = _metadata_property('_realndim_')
+    _original_ = _metadata_property('_original_')
+    _name = _metadata_property('_name')
+    _update_on = _metadata_property('_update_on')
+    _index_operations = _metadata_property('_index_operations')
+    observers = _metadata_property('observers')
+
     def __array_finalize__(self, obj):
         # see InfoArray.__array_finalize__ for comments
         if obj is None: return
-        super(Param, self).__array_finalize__(obj)
-        self._parent_ = getattr(obj, '_parent_', None)
-        self._parent_index_ = getattr(obj, '_parent_index_', None)
-        self._default_constraint_ = getattr(obj, '_default_constraint_', None)
-        self._current_slice_ = getattr(obj, '_current_slice_', None)
-        self._realshape_ = getattr(obj, '_realshape_', None)
-        self._realsize_ = getattr(obj, '_realsize_', None)
-        self._realndim_ = getattr(obj, '_realndim_', None)
-        self._original_ = getattr(obj, '_original_', None)
-        self._name = getattr(obj, '_name', None)
-        self._gradient_array_ = getattr(obj, '_gradient_array_', None)
-        self._update_on = getattr(obj, '_update_on', None)
-        try:
-            self._index_operations = obj._index_operations
-        except AttributeError:
-            pass
-        #self._index_operations = getattr(obj, '_index_operations', None)
-        #self.constraints = getattr(obj, 'constraints', None)
-        #self.priors = getattr(obj, 'priors', None)
+        d = self.__dict__
+        meta = getattr(obj, '_meta_', None)
+        if meta is None:
+            # a view of a plain array:
+            d['_meta_'] = ParamMetadata()
+            d['_current_slice_'] = None
+        else:
+            # share the metadata and take the gradient lazily (see gradient):
+            d['_meta_'] = meta
+            d['_current_slice_'] = obj._current_slice_
+            d['_gradient_view_'] = obj, None
 
     @property
     def param_array(self):
@@ -143,9 +266,18 @@ class Param(Parameterizable, ObsAr):
 
         To work on the real gradient array use: self.full_gradient
         """
-        if getattr(self, '_gradient_array_', None) is None:
-            self._gradient_array_ = np.empty(self._realshape_, dtype=np.float64)
-        return self._gradient_array_#[self._current_slice_]
+        g = self.__dict__.get('_gradient_array_', None)
+        if g is None:
+            # views take the gradient of the array they were made from on first use:
+            source, s = self.__dict__.pop('_gradient_view_', (None, None))
+            if source is None:
+                g = np.empty(self._realshape_, dtype=self.dtype)
+            elif s is None:
+                g = source.gradient
+            else:
+                g = source.gradient[s]
+            self._gradient_array_ = g
+        return g#[self._current_slice_]
 
     @gradient.setter
     def gradient(self, val):
@@ -161,28 +293,144 @@ class Param(Parameterizable, ObsAr):
         #    s += (Ellipsis,)
         new_arr = super(Param, self).__getitem__(s, *args, **kwargs)
         try:
-            new_arr._current_slice_ = s
-            new_arr._gradient_array_ = self.gradient[s]
-            new_arr._original_ = self._original_
-        except AttributeError: pass  # returning 0d array or float, double etc
+            d = new_arr.__dict__
+        except AttributeError:  # returning 0d array or float, double etc
+            return new_arr
+        d['_current_slice_'] = s
+        d['_gradient_view_'] = self, s
         return new_arr
 
     def _raveled_index(self, slice_index=None):
-        # return an index array on the raveled array, which is formed by the current_slice
-        # of this object
-        extended_realshape = np.cumprod((1,) + self._realshape_[:0:-1])[::-1]
-        ind = self._indices(slice_index)
-        if ind.ndim < 2: ind = ind[:, None]
-        return np.asarray(np.apply_along_axis(lambda x: np.sum(extended_realshape * x), 1, ind), dtype=int)
+        """
+        Return the (read only) index array of the elements selected by
+        slice_index (the current slice by default) into the raveled
+        original array.
+
+        It is computed from the coordinates of only the selected elements
+        (see :py:func:`_selected_coordinates`) and memoized for the current
+        slice, as every constrain, print etc. of this view asks for it.
+        """
+        if slice_index is not None and slice_index is not self._current_slice_:
+            return self._compute_raveled_index(slice_index)
+        cached = self.__dict__.get('_raveled_index_', None)
+        if cached is None or cached[0] != self._realshape_:
+            cached = self._realshape_, self._compute_raveled_index(self._current_slice_)
+            self._raveled_index_ = cached
+        return cached[1]
+
+    def _compute_raveled_index(self, slice_index):
+        if _is_full_slice(slice_index, self._realshape_):
+            ravi = np.arange(self._realsize_)
+        else:
+            ravi = np.ravel_multi_index(tuple(_selected_coordinates(self._realshape_, slice_index)), self._realshape_)
+        ravi.flags.writeable = False
+        return ravi
 
     def _raveled_index_for(self, obj):
         return self._raveled_index()
 
+    def _set_fixed_value(self, value):
+        """
+        Set this parameter to value (before fixing it) without updating the
+        model, only the own observers (e.g. caches) get notified. The model
+        needs to be updated afterwards, so that fixing many parameters to
+        values updates it only once.
+        """
+        self.values[...] = value
+        self.notify_observers(None, -np.inf)
+
     #===========================================================================
-    # Constrainable
+    # Resizing
     #===========================================================================
-    def _ensure_fixes(self):
-        if (not hasattr(self, "_fixes_")) or (self._fixes_ is None) or (self._fixes_.size != self._realsize_): self._fixes_ = np.ones(self._realsize_, dtype=bool)
+    def resize(self, new_shape, fill=0.):
+        """
+        Resize this parameter to new_shape, which may only differ from its
+        shape in the first dimension, i.e. rows get added or removed at the
+        end. The new elements are set to fill. Returns the resized parameter.
+
+        The values, gradient and constraints etc. of the remaining elements
+        are kept. Properties of the index operations which every element of
+        this parameter had (e.g. a constraint of the whole parameter) apply
+        to the new elements as well.
+
+        The memory of the model is reused, only the parameters behind this
+        one get moved. If it is not large enough, it grows geometrically, so
+        that growing a parameter row by row costs amortized constant time
+        per element for the last parameter of a model.
+
+        numpy arrays cannot change their shape in place, thus the resized
+        parameter is a new object, which replaces this one in the model
+        (see :py:func:`paramz.core.parameter_core._rebind_param`). Use the
+        returned parameter (or get it through the model, e.g. m.X) from
+        now on, this one and views of it taken before become outdated.
+        """
+        p, old_rows = self._resize(new_shape)
+        p.values[old_rows:] = fill
+        p.trigger_update()
+        return p
+
+    def append_rows(self, rows):
+        """
+        Append rows (of the shape of this parameter without its first
+        dimension) at the end of this parameter and return the resized
+        parameter, see :py:meth:`resize`.
+        """
+        rows = np.asarray(rows, dtype=self.dtype).reshape((-1,) + self.shape[1:])
+        p, old_rows = self._resize((self.shape[0] + rows.shape[0],) + self.shape[1:])
+        p.values[old_rows:] = rows
+        p.trigger_update()
+        return p
+
+    def _resize(self, new_shape):
+        """
+        Resize self (and its hierarchy) to new_shape and return the resized
+        parameter and the number of rows self had. The elements of new rows
+        are zero.
+        """
+        from .core.parameter_core import _copy_into_arena, _uses_memory
+        from .core.index_operations import ParameterIndexOperationsView
+        new_shape = tuple(np.atleast_1d(new_shape).astype(int).tolist())
+        if self._original_ is not self:
+            raise ValueError("Only a parameter itself can be resized, not a view of it")
+        if len(new_shape) != self.ndim or new_shape[1:] != self.shape[1:] or new_shape[0] < 0:
+            raise ValueError("Cannot resize {} of shape {} to {}, only the first dimension can change".format(self.name, self.shape, new_shape))
+        old_rows, old_size = self.shape[0], self.size
+        size = int(np.prod(new_shape))
+        grow = size - old_size
+
+        # constraints etc. of the whole parameter apply to the new elements:
+        for iop in self._index_operations.values():
+            whole = [prop for prop, runs in iop._run_items() if runs_size(runs) == old_size > 0]
+            if grow > 0:
+                iop.shift_right(old_size, grow)
+            elif grow < 0:
+                iop.shift_left(size, -grow)
+            if isinstance(iop, ParameterIndexOperationsView):
+                iop._size += grow
+            for prop in whole:
+                if grow > 0:
+                    iop.add(prop, np.arange(old_size, size))
+
+        self._realshape_ = new_shape
+        self._realsize_ = size
+        self.__dict__['_current_slice_'] = (slice(new_shape[0]),)
+        if self.has_parent():
+            parent = self._parent_
+            while parent is not None:
+                parent.size += grow
+                parent = parent._parent_
+            self._parent_._children_size_changed(self._parent_index_ + 1, grow)
+            self._highest_parent_._layout_parameters()
+            p = self._parent_.parameters[self._parent_index_]
+        else:
+            # our own memory, with room for growing (amortized doubling):
+            arena = self.__dict__.get('_arena_', None)
+            if arena is None or arena.shape[1] < size or not _uses_memory(self, arena[0], 0):
+                arena = np.empty((2, max(size, 2 * old_size)), dtype=self.dtype)
+            p = _copy_into_arena(self, arena, 0)
+            p.__dict__['_arena_'] = arena
+        p._highest_parent_._connect_fixes()
+        return p, old_rows
 
     #===========================================================================
     # Convenience
@@ -205,9 +453,30 @@ class Param(Parameterizable, ObsAr):
         s = self.__new__(self.__class__, name=self.name, input_array=self.view(np.ndarray).copy())
         memo[id(self)] = s
         import copy
-        Pickleable.__setstate__(s, copy.deepcopy(self.__getstate__(), memo))
+        Pickleable.__setstate__(s, s._set_metadata(copy.deepcopy(self.__getstate__(), memo)))
         return s
 
+    def __getstate__(self):
+        state = super(Param, self).__getstate__()
+        state.update(self._meta_.__getstate__())
+        return state
+
+    def __setstate__(self, state):
+        super(Param, self).__setstate__((state[0], self._set_metadata(state[1])))
+
+    def _set_metadata(self, state):
+        """
+        Move the metadata out of the pickled state into a new
+        :py:class:`ParamMetadata` of self and return the rest of the state.
+        """
+        meta = ParamMetadata()
+        state = dict(state)
+        for name in ParamMetadata._state_:
+            if name in state:
+                setattr(meta, name, state.pop(name))
+        self.__dict__['_meta_'] = meta
+        return state
+
     def _setup_observers(self):
         """
         Setup the default observers
@@ -239,48 +508,81 @@ class Param(Parameterizable, ObsAr):
         return 0
 
     def get_property_string(self, propname):
+        # only the sizes are needed, so do not expand the runs of the index operations:
         prop = self._index_operations[propname]
-        return [' '.join(map(lambda c: str(c[0]) if c[1].size == self._realsize_ else "{" + str(c[0]) + "}", prop.items()))]
+        return [' '.join(map(lambda c: str(c[0]) if runs_size(c[1]) == self._realsize_ else "{" + str(c[0]) + "}", prop._run_items()))]
 
     def __repr__(self, *args, **kwargs):
         name = "\033[1m{x:s}\033[0;0m:\n".format(
                             x=self.hierarchy_name())
         return name + super(Param, self).__repr__(*args, **kwargs)
     def _indices(self, slice_index=None):
-        # get a int-array containing all indices in the first axis.
+        """
+        The multi-indices of the elements selected by slice_index (the
+        current slice by default), see :py:class:`SelectedIndices`.
+        """
         if slice_index is None:
             slice_index = self._current_slice_
-        #try:
-        indices = np.indices(self._realshape_, dtype=int)
-        indices = indices[(slice(None),)+slice_index]
-        indices = np.rollaxis(indices, 0, indices.ndim).reshape(-1,self._realndim_)
-            #print indices_
-            #if not np.all(indices==indices__):
-            #    import ipdb; ipdb.set_trace()
-        #except:
-        #    indices = np.indices(self._realshape_, dtype=int)
-        #    indices = indices[(slice(None),)+slice_index]
-        #    indices = np.rollaxis(indices, 0, indices.ndim)
-        return indices
+        return SelectedIndices(self._realshape_, slice_index)
 
     def _max_len_names(self, gen, header):
         return reduce(lambda a, b: max(a, len(" ".join(map(str, b)))), gen, len(header))
 
-    def _max_len_values(self):
-        return reduce(lambda a, b: max(a, len("{x:=.{0}g}".format(__precision__, x=b))), self.flat, len(self.hierarchy_name()))
+    def _max_len_values(self, rows=None):
+        vals = self.values.ravel()
+        if rows is not None: vals = vals[rows]
+        fmt = '%.{}g'.format(__precision__)
+        return max([len(self.hierarchy_name())] + np.char.str_len(np.char.mod(fmt, vals)).tolist())
 
-    def _max_len_index(self, ind):
-        return reduce(lambda a, b: max(a, len(str(b))), ind, len(__index_name__))
+    def _max_len_index(self, ind, rows=None):
+        return max([len(__index_name__)] + [len(i) for i in ind.strings(rows)])
 
-    def _repr_html_(self, indices=None, iops=None, lx=None, li=None, lls=None):
-        """Representation of the parameter in html for notebook display."""
+    def _print_rows(self, full=False):
+        """
+        The rows (of the raveled selection) to print: None for all of them,
+        or the first and last __print_threshold__ rows, if this parameter
+        has more than __print_summary_size__ elements and the full table was
+        not asked for.
+        """
+        if full or self.size <= __print_summary_size__:
+            return None
+        return np.r_[:__print_threshold__, self.size-__print_threshold__:self.size]
+
+    def _summary_stats(self):
+        vals = self.values
+        return "{} values: min {}, max {}, mean {}, std {}".format(self.size, *[
+            "{1:.{0}g}".format(__precision__, f(vals)) for f in (np.min, np.max, np.mean, np.std)])
+
+    def _table(self, indices=None, iops=None, lx=None, li=None, lls=None, full=False):
+        """
+        Everything needed to print the rows of the table of this parameter:
+        the rows to print (see :py:meth:`_print_rows`), the formatted index,
+        value and index operation strings of the printed rows, and the
+        widths of the columns. If given, iops only hold the properties of
+        the printed rows.
+        """
         filter_ = self._current_slice_
-        vals = self.flat
+        rows = self._print_rows(full)
         if indices is None: indices = self._indices(filter_)
         if iops is None:
             ravi = self._raveled_index(filter_)
+            if rows is not None: ravi = ravi[rows]
             iops = OrderedDict([name, iop.properties_for(ravi)] for name, iop in self._index_operations.items())
         if lls is None: lls = [self._max_len_names(iop, name) for name, iop in iops.items()]
+        index_strings = indices.strings(rows)
+        if li is None: li = max([len(__index_name__)] + [len(i) for i in index_strings])
+        if lx is None: lx = self._max_len_values(rows)
+
+        vals = self.values.ravel()
+        if rows is not None: vals = vals[rows]
+        fmt = '%.{}f'.format(__precision__)
+        values = np.char.mod(fmt, vals).tolist()
+        props = OrderedDict([name, [' '.join(map(str, p)) for p in iop]] for name, iop in iops.items())
+        return rows, index_strings, values, props, lx, li, lls
+
+    def _repr_html_(self, indices=None, iops=None, lx=None, li=None, lls=None, full=False):
+        """Representation of the parameter in html for notebook display."""
+        rows, index_strings, values, props, lx, li, lls = self._table(indices, iops, lx, li, lls, full)
 
         header_format = """
 <tr>
@@ -288,7 +590,7 @@ class Param(Parameterizable, ObsAr):
   <th><b>{x}</b></th>
   <th><b>{iops}</b></th>
 </tr>"""
-        header = header_format.format(x=self.hierarchy_name(), i=__index_name__, iops="</b></th><th><b>".join(list(iops.keys())))  # nice header for printing
+        header = header_format.format(x=self.hierarchy_name(), i=__index_name__, iops="</b></th><th><b>".join(list(props.keys())))  # nice header for printing
 
         to_print = ["""<style type="text/css">
 .tg  {padding:2px 3px;word-break:normal;border-collapse:collapse;border-spacing:0;border-color:#DCDCDC;margin:0px auto;width:100%;}
@@ -300,14 +602,18 @@ class Param(Parameterizable, ObsAr):
         to_print.append('<table class="tg">')
         to_print.append(header)
 
-        format_spec = self._format_spec(indices, iops, lx, li, lls, False)
+        format_spec = self._format_spec(None, props, lx, li, lls, False)
         format_spec[:2] = ["<tr><td class=tg-left>{i}</td>".format(i=format_spec[0]), "<td class=tg-right>{i}</td>".format(i=format_spec[1])]
         for i in range(2, len(format_spec)):
             format_spec[i] = '<td class=tg-left>{c}</td>'.format(c=format_spec[i])
         format_spec = "".join(format_spec) + '</tr>'
 
-        for i in range(self.size):
-            to_print.append(format_spec.format(index=indices[i], value="{1:.{0}f}".format(__precision__, vals[i]), **dict((name, ' '.join(map(str, iops[name][i]))) for name in iops)))
+        for i in range(len(values)):
+            if rows is not None and i == __print_threshold__:
+                to_print.append(format_spec.format(index='...', value='...', **dict((name, '...') for name in props)))
+            to_print.append(format_spec.format(index=index_strings[i], value=values[i], **dict((name, props[name][i]) for name in props)))
+        if rows is not None:
+            to_print.append('<tr><td class=tg-left colspan={}>{}</td></tr>'.format(2 + len(props), self._summary_stats()))
         return '\n'.join(to_print)
 
     def _format_spec(self, indices, iops, lx=None, li=None, lls=None, VT100=True):
@@ -325,26 +631,44 @@ class Param(Parameterizable, ObsAr):
             format_spec.append(f)
         return format_spec
 
+    def _str_lines(self, indices=None, iops=None, lx=None, li=None, lls=None, only_name=False, VT100=True, full=False):
+        """
+        Generate the lines of the table of this parameter, see :py:meth:`__str__`.
+        """
+        rows, index_strings, values, props, lx, li, lls = self._table(indices, iops, lx, li, lls, full)
+        format_spec = '  |  '.join(self._format_spec(None, props, lx, li, lls, VT100))
 
-    def __str__(self, indices=None, iops=None, lx=None, li=None, lls=None, only_name=False, VT100=True):
-        filter_ = self._current_slice_
-        vals = self.flat
-        if indices is None: indices = self._indices(filter_)
-        if iops is None:
-            ravi = self._raveled_index(filter_)
-            iops = OrderedDict([name, iop.properties_for(ravi)] for name, iop in self._index_operations.items())
-        if lls is None: lls = [self._max_len_names(iop, name) for name, iop in iops.items()]
+        if not only_name: yield format_spec.format(index=__index_name__, value=self.hierarchy_name(), **dict((name, name) for name in props))
+        else: yield format_spec.format(index='-'*li, value=self.hierarchy_name(), **dict((name, '-'*l) for name, l in zip(props, lls)))
 
-        format_spec = '  |  '.join(self._format_spec(indices, iops, lx, li, lls, VT100))
+        for i in range(len(values)):
+            if rows is not None and i == __print_threshold__:
+                yield format_spec.format(index='...', value='...', **dict((name, '...') for name in props))
+            yield format_spec.format(index=index_strings[i], value=values[i], **dict((name, props[name][i]) for name in props))
+        if rows is not None:
+            yield '  ' + self._summary_stats()
 
-        to_print = []
+    def __str__(self, indices=None, iops=None, lx=None, li=None, lls=None, only_name=False, VT100=True, full=False):
+        """
+        The table of the values and index operations of this parameter.
 
-        if not only_name: to_print.append(format_spec.format(index=__index_name__, value=self.hierarchy_name(), **dict((name, name) for name in iops)))
-        else: to_print.append(format_spec.format(index='-'*li, value=self.hierarchy_name(), **dict((name, '-'*l) for name, l in zip(iops, lls))))
+        Parameters with more than __print_summary_size__ elements only show
+        the first and last rows and summary statistics, unless full is True.
+        """
+        return '\n'.join(self._str_lines(indices, iops, lx, li, lls, only_name, VT100, full))
 
-        for i in range(self.size):
-            to_print.append(format_spec.format(index=indices[i], value="{1:.{0}f}".format(__precision__, vals[i]), **dict((name, ' '.join(map(str, iops[name][i]))) for name in iops)))
-        return '\n'.join(to_print)
+    def print_table(self, f=None, full=True, VT100=False):
+        """
+        Write the table of this parameter (see :py:meth:`__str__`) line by
+        line to the file object f (sys.stdout by default), without building
+        the whole string first. Other than printing, this writes the full
+        table by default.
+        """
+        if f is None:
+            import sys
+            f = sys.stdout
+        for line in self._str_lines(VT100=VT100, full=full):
+            f.write(line + '\n')
 
     def build_pydot(self,G): # pragma: no cover
         """
@@ -451,28 +775,49 @@ class ParamConcatenation(object):
         for par in self.parents:
             par.trigger_update(trigger_parent=False)
 
+    def _constrain_all(self, constraint, warning=True):
+        """
+        Constrain all params, in one go per highest parent
+        (see :py:meth:`paramz.Parameterized.constrain_many`), without
+        updating the model.
+        """
+        roots = OrderedDict()
+        for param in self.params:
+            root = param._highest_parent_
+            if root is param:
+                param.constrain(constraint, warning, trigger_parent=False)
+            else:
+                roots.setdefault(root, []).append(param)
+        for root, params in roots.items():
+            root._constrain_many([(param, constraint) for param in params], warning)
+
     def constrain(self, constraint, warning=True):
-        [param.constrain(constraint, trigger_parent=False) for param in self.params]
+        self._constrain_all(constraint, warning)
         self.update_all_params()
     constrain.__doc__ = Param.constrain.__doc__
 
     def constrain_positive(self, warning=True):
-        [param.constrain_positive(warning, trigger_parent=False) for param in self.params]
+        self._constrain_all(Logexp(), warning)
         self.update_all_params()
     constrain_positive.__doc__ = Param.constrain_positive.__doc__
 
     def constrain_fixed(self, value=None, warning=True, trigger_parent=True):
-        [param.constrain_fixed(value, warning, trigger_parent) for param in self.params]
+        if value is not None:
+            for param in self.params:
+                param._set_fixed_value(value)
+        self._constrain_all(__fixed__, warning)
+        if trigger_parent or value is not None:
+            self.update_all_params()
     constrain_fixed.__doc__ = Param.constrain_fixed.__doc__
     fix = constrain_fixed
 
     def constrain_negative(self, warning=True):
-        [param.constrain_negative(warning, trigger_parent=False) for param in self.params]
+        self._constrain_all(NegativeLogexp(), warning)
         self.update_all_params()
     constrain_negative.__doc__ = Param.constrain_negative.__doc__
 
     def constrain_bounded(self, lower, upper, warning=True):
-        [param.constrain_bounded(lower, upper, warning, trigger_parent=False) for param in self.params]
+        self._constrain_all(Logistic(lower, upper), warning)
         self.update_all_params()
     constrain_bounded.__doc__ = Param.constrain_bounded.__doc__
 
@@ -500,7 +845,7 @@ class ParamConcatenation(object):
     #def untie(self, *ties):
     #    [param.untie(*ties) for param in self.params]
 
-    def checkgrad(self, verbose=False, step=1e-6, tolerance=1e-3):
+    def checkgrad(self, verbose=False, step=None, tolerance=1e-3):
         return self.params[0]._highest_parent_._checkgrad(self, verbose, step, tolerance)
     #checkgrad.__doc__ = Gradcheckable.checkgrad.__doc__
 
@@ -514,15 +859,18 @@ class ParamConcatenation(object):
     def __str__(self, **kwargs):
         params = self.params
 
+        full = kwargs.get('full', False)
+        rows = [p._print_rows(full) for p in params]
         indices = [p._indices() for p in params]
-        lx = max([p._max_len_values() for p in params])
-        li = max([p._max_len_index(i) for p, i in zip(params, indices)])
+        lx = max([p._max_len_values(r) for p, r in zip(params, rows)])
+        li = max([p._max_len_index(i, r) for p, i, r in zip(params, indices, rows)])
 
         lls = None
         params_iops = []
-        for p in params:
+        for p, r in zip(params, rows):
             filter_ = p._current_slice_
             ravi = p._raveled_index(filter_)
+            if r is not None: ravi = ravi[r]
             iops = OrderedDict([name, iop.properties_for(ravi)] for name, iop in p._index_operations.items())
             _lls = [p._max_len_names(iop, name) for name, iop in iops.items()]
             if lls is None:
@@ -36,11 +36,13 @@ except ImportError:
     # 3.7 and later
     from re import Pattern as _pattern_type
 
-from .core.parameter_core import Parameterizable, adjust_name_for_printing
+from .core.parameter_core import Parameterizable, adjust_name_for_printing, _current_param
+from .core.name_index import NameIndex
 from .core import HierarchyError
+from .transformations import Transformation, __fixed__
 
 import logging
-from collections import OrderedDict
+from collections import OrderedDict, Counter
 from functools import reduce
 logger = logging.getLogger("parameters changed meta")
 
@@ -133,97 +135,144 @@ class Parameterized(with_metaclass(ParametersChangedMeta, Parameterizable)):
 
         Add all parameters to this param class, you can insert parameters
         at any given index using the :func:`list.insert` syntax
+
+        Returns the linked parameter. A Param gets copied into the memory of
+        the model and replaced by a view of it (see
+        :py:func:`paramz.core.parameter_core._rebind_param`), thus use the
+        returned parameter (or get it through the model, e.g. m.X) from now
+        on.
         """
+        param = _current_param(param)
         if param in self.parameters and index is not None:
             self.unlink_parameter(param)
             return self.link_parameter(param, index)
         # elif param.has_parent():
         #    raise HierarchyError, "parameter {} already in another model ({}), create new object (or copy) for adding".format(param._short(), param._highest_parent_._short())
         elif param not in self.parameters:
+            self._link_parameters([param], index)
+            return self.parameters[param._parent_index_]
+        else:
+            raise HierarchyError("""Parameter exists already, try making a copy""")
+
+    def link_parameters(self, *parameters):
+        """
+        convenience method for adding several
+        parameters without gradient specification
+
+        The parameters get appended in the given order. The new layout is
+        computed once for all of them and the hierarchy gets reconnected
+        only once, so that linking many parameters is linear in their number.
+        """
+        parameters = [_current_param(param) for param in parameters]
+        seen = set()
+        for param in parameters:
+            if param._parent_ is self or id(param) in seen:
+                raise HierarchyError("""Parameter exists already, try making a copy""")
+            seen.add(id(param))
+        self._link_parameters(parameters, None)
+
+    def _link_parameters(self, parameters, index):
+        """
+        Insert the parameters (which are not children of self) at index
+        (append for None) and connect the hierarchy once afterwards.
+        """
+        for param in parameters:
             if param.has_parent():
                 def visit(parent, self):
                     if parent is self:
                         raise HierarchyError("You cannot add a parameter twice into the hierarchy")
                 param.traverse_parents(visit, self)
                 param._parent_.unlink_parameter(param)
-            # make sure the size is set
-            if index is None:
-                start = sum(p.size for p in self.parameters)
-                for name, iop in self._index_operations.items():
-                    iop.shift_right(start, param.size)
-                    iop.update(param._index_operations[name], self.size)
-                param._parent_ = self
-                param._parent_index_ = len(self.parameters)
-                self.parameters.append(param)
-            else:
-                start = sum(p.size for p in self.parameters[:index])
-                for name, iop in self._index_operations.items():
-                    iop.shift_right(start, param.size)
-                    iop.update(param._index_operations[name], start)
-                param._parent_ = self
-                param._parent_index_ = index if index>=0 else len(self.parameters[:index])
-                for p in self.parameters[index:]:
-                    p._parent_index_ += 1
-                self.parameters.insert(index, param)
-
+        # make sure the size is set
+        if index is None:
+            index = len(self.parameters)
+        elif index < 0:
+            index = len(self.parameters[:index])
+        offsets = self._parameter_offsets()
+        start = offsets[index]
+        starts = [start]
+        for param in parameters:
+            starts.append(starts[-1] + param.size)
+        size = starts[-1] - start
+        for name, iop in self._index_operations.items():
+            iop.shift_right(start, size)
+            for param, pstart in zip(parameters, starts):
+                iop.update(param._index_operations[name], pstart)
+        for p in self.parameters[index:]:
+            p._parent_index_ += len(parameters)
+        for i, param in enumerate(parameters, index):
+            param._parent_ = self
+            param._parent_index_ = i
+            param._highest_parent_changed()
+        self.parameters[index:index] = parameters
+        self.__dict__.pop('_parameter_name_index_', None)
+        # the offsets of the following children get moved in _children_size_changed:
+        offsets[index:index] = starts[:-1]
+
+        for param in parameters:
             param.add_observer(self, self._pass_through_notify_observers, -np.inf)
+        self._name_index_changed()
 
-            parent = self
-            while parent is not None:
-                parent.size += param.size
-                parent = parent._parent_
-            self._notify_parent_change()
+        parent = self
+        while parent is not None:
+            parent.size += size
+            parent = parent._parent_
+        # only the new parameters need new views, the others get moved:
+        for param in parameters:
+            param._parent_changed(self)
+        self._children_size_changed(index + len(parameters), size)
 
-            if not self._in_init_ and self._highest_parent_._model_initialized_:
-                #self._connect_parameters()
-                #self._notify_parent_change()
+        if not self._in_init_ and self._highest_parent_._model_initialized_:
+            #self._connect_parameters()
+            #self._notify_parent_change()
 
-                self._highest_parent_._connect_parameters()
-                self._highest_parent_._notify_parent_change()
-                self._highest_parent_._connect_fixes()
-            return param
-        else:
-            raise HierarchyError("""Parameter exists already, try making a copy""")
-
-    def link_parameters(self, *parameters):
-        """
-        convenience method for adding several
-        parameters without gradient specification
-        """
-        [self.link_parameter(p) for p in parameters]
+            self._highest_parent_._connect_parameters()
+            self._highest_parent_._connect_fixes()
 
     def unlink_parameter(self, param):
         """
         :param param: param object to remove from being a parameter of this parameterized object.
         """
+        param = _current_param(param)
         if not param in self.parameters:
             try:
                 raise HierarchyError("{} does not belong to this object {}, remove parameters directly from their respective parents".format(param._short(), self.name))
             except AttributeError:
                 raise HierarchyError("{} does not seem to be a parameter, remove parameters directly from their respective parents".format(str(param)))
 
-        start = sum([p.size for p in self.parameters[:param._parent_index_]])
+        index = param._parent_index_
+        start = self._parameter_offsets()[index]
         self.size -= param.size
-        del self.parameters[param._parent_index_]
-        self._remove_parameter_name(param)
+        del self.parameters[index]
+        self.__dict__.pop('_parameter_name_index_', None)
+        del self._parameter_offsets()[index]
+        for p in self.parameters[index:]:
+            p._parent_index_ -= 1
+        self._drop_parameter_name(param.name)
+        self._name_index_changed()
+        # the names of the other children get registered again, as one of
+        # them may have the freed name (the memory is connected below):
+        self._add_parameter_names()
 
 
         param._disconnect_parent()
+        param._name_index_changed()
         param.remove_observer(self, self._pass_through_notify_observers)
         for name, iop in self._index_operations.items():
             iop.shift_left(start, param.size)
-
-        self._connect_parameters()
-        self._notify_parent_change()
+        # the param keeps its memory, the hierarchy gets a new arena:
+        self._highest_parent_.__dict__.pop('_arena_', None)
 
         parent = self._parent_
         while parent is not None:
             parent.size -= param.size
             parent = parent._parent_
+        self._children_size_changed(index, -param.size)
+        offsets = self._parameter_offsets()
+        self._param_slices_ = [slice(a, b) for a, b in zip(offsets, offsets[1:])]
 
         self._highest_parent_._connect_parameters()
         self._highest_parent_._connect_fixes()
-        self._highest_parent_._notify_parent_change()
 
     def _connect_parameters(self, ignore_added_names=False):
         # connect parameterlist to this parameterized object
@@ -240,7 +289,7 @@ class Parameterized(with_metaclass(ParametersChangedMeta, Parameterizable)):
         old_size = 0
         self._param_slices_ = []
         for i, p in enumerate(self.parameters):
-            if not p.param_array.flags['C_CONTIGUOUS']:# getattr(p, 'shape', None) != getattr(p, '_realshape_', None):
+            if isinstance(p, np.ndarray) and not p.flags['C_CONTIGUOUS']:# getattr(p, 'shape', None) != getattr(p, '_realshape_', None):
                 raise ValueError("""
 Have you added an additional dimension to a Param object?
 
@@ -256,26 +305,31 @@ which reproduces this error.
 All parameter arrays must be C_CONTIGUOUS
 """)
 
-            p._parent_ = self
+            if p._parent_ is not self:
+                p._parent_ = self
+                p._highest_parent_changed()
             p._parent_index_ = i
 
             pslice = slice(old_size, old_size + p.size)
-
-            # first connect all children
-            p._propagate_param_grad(self.param_array[pslice], self.gradient_full[pslice])
-
-            # then connect children to self
-            self.param_array[pslice] = p.param_array.flat  # , requirements=['C', 'W']).ravel(order='C')
-            self.gradient_full[pslice] = p.gradient_full.flat  # , requirements=['C', 'W']).ravel(order='C')
-
-            p.param_array.data = self.param_array[pslice].data
-            p.gradient_full.data = self.gradient_full[pslice].data
-
             self._param_slices_.append(pslice)
-
-            self._add_parameter_name(p)
             old_size += p.size
 
+        # connect the memory of all children first, as Params may get
+        # replaced by views of it (see _rebind_param):
+        self._layout_parameters()
+        self._add_parameter_names()
+
+    def _add_parameter_names(self):
+        """
+        Make all children accessible as attributes under their names,
+        renaming children with the same name (see _add_parameter_name).
+        """
+        # only children sharing their name with others need to be searched for:
+        name_counts = Counter(p.name for p in self.parameters)
+        unique_names = set(name for name, count in name_counts.items() if count == 1)
+        for p in self.parameters:
+            self._add_parameter_name(p, unique_names)
+
     #===========================================================================
     # Get/set parameters:
     #===========================================================================
@@ -284,12 +338,21 @@ All parameter arrays must be C_CONTIGUOUS
         create a list of parameters, matching regular expression regexp
         """
         if not isinstance(regexp, _pattern_type): regexp = compile(regexp)
-        found_params = []
-        def visit(innerself, regexp):
-            if (innerself is not self) and regexp.match(innerself.hierarchy_name().partition('.')[2]):
-                found_params.append(innerself)
-        self.traverse(visit, regexp)
-        return found_params
+        root = self._highest_parent_
+        return root._name_index().grep(regexp, None if root is self else self)
+
+    def _name_index(self):
+        """
+        The :py:class:`paramz.core.name_index.NameIndex` of the hierarchy
+        below self. It gets built lazily and is dropped, whenever parameters
+        get linked, unlinked or renamed (see :py:meth:`_name_index_changed`).
+        """
+        index = self.__dict__.get('_name_index_', None)
+        if index is None:
+            index = NameIndex(self)
+            # set directly, as __setattr__ checks the parameter names:
+            self.__dict__['_name_index_'] = index
+        return index
 
     def __getitem__(self, name, paramlist=None):
         if isinstance(name, (int, slice, tuple, np.ndarray)):
@@ -332,12 +395,141 @@ If you are loading a model, set updates off, then initialize, then set the value
     def __setattr__(self, name, val):
         # override the default behaviour, if setting a param, so broadcasting can by used
         if hasattr(self, "parameters"):
-            pnames = self.parameter_names(False, adjust_for_printing=True, recursive=False)
-            if name in pnames:
-                param = self.parameters[pnames.index(name)]
+            pindex = self._parameter_name_index().get(name, None)
+            if pindex is not None:
+                param = self.parameters[pindex]
                 param[:] = val; return
         return object.__setattr__(self, name, val)
 
+    def _parameter_name_index(self):
+        """
+        Dictionary of the (printing) names of the direct children to their
+        index in self.parameters. It gets built lazily and is dropped,
+        whenever a name of a child or the children change, so that setting
+        attributes does not need to go through all parameter names.
+        """
+        pindex = self.__dict__.get('_parameter_name_index_', None)
+        if pindex is None:
+            pindex = dict()
+            for i, pname in enumerate(self.parameter_names(False, adjust_for_printing=True, recursive=False)):
+                pindex.setdefault(pname, i)
+            # set directly, as __setattr__ itself needs the name index:
+            self.__dict__['_parameter_name_index_'] = pindex
+        return pindex
+
+    #===========================================================================
+    # Bulk constraining:
+    #===========================================================================
+    def _raveled_index_for_many(self, what):
+        """
+        The raveled index (inside self) of a parameter, a
+        :py:class:`paramz.param.ParamConcatenation` or all parameters
+        matching the regular expression what (see :py:meth:`grep_param_names`).
+        """
+        from .param import ParamConcatenation
+        if isinstance(what, (Parameterizable, ParamConcatenation)):
+            return self._raveled_index_for(what)
+        params = self.grep_param_names(what)
+        if len(params) < 1: raise AttributeError(what)
+        return np.concatenate([self._raveled_index_for(p) for p in params])
+
+    def constrain_many(self, constraints, warning=True, trigger_parent=True):
+        """
+        Constrain many parameters at once, e.g.::
+
+            m.constrain_many([('.*variance', Logexp()), (m.kern.lengthscale, Logistic(0, 10))])
+
+        All parameters to constrain to the same transformation are collected
+        into one index update and the model gets updated only once at the end,
+        as opposed to constraining each parameter on its own.
+
+        :param constraints: list of pairs (or dictionary) of a parameter or
+                            regular expression (see :py:meth:`grep_param_names`)
+                            and the :py:class:`paramz.transformations.Transformation`
+                            to constrain it to, or __fixed__ to fix it.
+                            Later entries win for overlapping parameters.
+                            Note that Params can not be dictionary keys, as
+                            arrays are not hashable.
+        :param warning: print a warning if re-constraining parameters.
+        """
+        self._constrain_many(constraints, warning)
+        self.trigger_update(trigger_parent)
+
+    def _constrain_many(self, constraints, warning):
+        if isinstance(constraints, dict):
+            constraints = constraints.items()
+        labels = np.full(self.size, -1, dtype=int)
+        transforms = []
+        for what, transform in constraints:
+            if not (isinstance(transform, Transformation) or transform == __fixed__):
+                raise ValueError('Can only constrain with paramz.transformations.Transformation object')
+            if transform not in transforms:
+                transforms.append(transform)
+            labels[self._raveled_index_for_many(what)] = transforms.index(transform)
+
+        x = self._flat_param_array()
+        fixed, unfixed, reconstrained = [], [], False
+        for i, transform in enumerate(transforms):
+            index = np.flatnonzero(labels == i)
+            if index.size == 0:
+                continue
+            if transform == __fixed__:
+                # fixing does not override the previous constraints:
+                fixed.append(index)
+            else:
+                x[index] = transform.initialize(x[index])
+                for t in self.constraints.properties():
+                    removed = self.constraints.remove(t, index)
+                    reconstrained |= removed.size > 0
+                    if t is __fixed__:
+                        unfixed.append(removed)
+            self.constraints.add(transform, index)
+
+        if warning and reconstrained:
+            logging.getLogger(self.name).warning("reconstraining parameters {}".format(self.hierarchy_name() or self.name))
+        if unfixed:
+            self._highest_parent_._set_unfixed(self, np.concatenate(unfixed))
+        if fixed:
+            self._highest_parent_._set_fixed(self, np.concatenate(fixed))
+
+    def fix_many(self, parameters, value=None, warning=True, trigger_parent=True):
+        """
+        Fix all given parameters (or regular expressions) at once, see
+        :py:meth:`constrain_many`.
+
+        :param value: set each of the parameters to value before fixing
+                      (see :py:meth:`paramz.param.Param.constrain_fixed`),
+                      the model still gets updated only once.
+        """
+        if value is not None:
+            from .param import ParamConcatenation
+            for what in parameters:
+                if isinstance(what, ParamConcatenation):
+                    params = what.params
+                elif isinstance(what, Parameterizable):
+                    params = what.flattened_parameters
+                else:
+                    params = [p for q in self.grep_param_names(what) for p in q.flattened_parameters]
+                for param in params:
+                    param._set_fixed_value(value)
+        self.constrain_many([(p, __fixed__) for p in parameters], warning, trigger_parent)
+
+    def unfix_many(self, parameters, warning=True, trigger_parent=True):
+        """
+        Unfix all given parameters (or regular expressions) at once, see
+        :py:meth:`constrain_many`. The constraints set before fixing get
+        restored.
+
+        :param warning: print a warning if none of the parameters was fixed.
+        """
+        index = np.concatenate([self._raveled_index_for_many(p) for p in parameters] or [np.empty(0, dtype=int)])
+        unfixed = self.constraints.remove(__fixed__, np.unique(index))
+        if warning and index.size > 0 and unfixed.size == 0:
+            logging.getLogger(self.name).warning("none of the parameters to unfix was fixed")
+        self._highest_parent_._set_unfixed(self, unfixed)
+        self.trigger_update(trigger_parent)
+        return unfixed
+
     #===========================================================================
     # Pickling
     #===========================================================================
@@ -428,7 +620,10 @@ If you are loading a model, set updates off, then initialize, then set the value
 
         return format_spec
 
-    def __str__(self, header=True, VT100=True):
+    def _str_lines(self, header=True, VT100=True):
+        """
+        Generate the lines of the table of this parameterized, see :py:meth:`__str__`.
+        """
         name = adjust_name_for_printing(self.name) + "."
         names = self.parameter_names(adjust_for_printing=True)
         desc = self._description_str
@@ -438,14 +633,26 @@ If you are loading a model, set updates off, then initialize, then set the value
 
         format_spec = '  |  '.join(self._format_spec(name, names, desc, iops, VT100))
 
-        to_print = []
-
         if header:
-            to_print.append(format_spec.format(name=name, desc='value', **dict((name, name) for name in iops)))
+            yield format_spec.format(name=name, desc='value', **dict((name, name) for name in iops))
 
         for i in range(len(names)):
-            to_print.append(format_spec.format(name=names[i], desc=desc[i], **dict((name, iops[name][i]) for name in iops)))
-        return '\n'.join(to_print)
+            yield format_spec.format(name=names[i], desc=desc[i], **dict((name, iops[name][i]) for name in iops))
+
+    def __str__(self, header=True, VT100=True):
+        return '\n'.join(self._str_lines(header, VT100))
+
+    def print_table(self, f=None, header=True, VT100=False):
+        """
+        Write the table of this parameterized (see :py:meth:`__str__`) line
+        by line to the file object f (sys.stdout by default), without
+        building the whole string first.
+        """
+        if f is None:
+            import sys
+            f = sys.stdout
+        for line in self._str_lines(header, VT100):
+            f.write(line + '\n')
 
     def build_pydot(self, G=None): # pragma: no cover
         """
@@ -130,9 +130,7 @@ class Test(unittest.TestCase):
         self.assertListEqual(removed.tolist(), [0, 2])
 
     def test_misc(self):
-        #py3 fix
-        #for k,v in self.param_index.copy()._properties.iteritems():
-        for k,v in self.param_index.copy()._properties.items():
+        for k,v in self.param_index.copy().items():
             self.assertListEqual(self.param_index[k].tolist(), v.tolist())
         self.assertEqual(self.param_index.size, 8)
         self.assertEqual(self.view.size, 5)
@@ -149,6 +147,90 @@ class Test(unittest.TestCase):
             {one:[1], two:[3], three:[5]}
             )
 
+    def test_runs(self):
+        self.param_index.add(one, np.r_[100:200])
+        self.param_index.add(one, np.r_[150:300])
+        self.assertListEqual(self.param_index._properties[one].tolist(), [[3,4], [9,10], [100,300]])
+        self.param_index.shift_right(150, 10)
+        self.assertListEqual(self.param_index._properties[one].tolist(), [[3,4], [9,10], [100,150], [160,310]])
+        self.param_index.shift_left(150, 10)
+        self.assertListEqual(self.param_index._properties[one].tolist(), [[3,4], [9,10], [100,300]])
+        self.assertEqual(self.param_index.size, 8 + 200)
+        self.param_index.remove(one, np.r_[:1000])
+        self.assertNotIn(one, self.param_index.properties())
+
+    def test_runs_against_dense(self):
+        np.random.seed(1234)
+        param_index = ParameterIndexOperations()
+        dense = set()
+        for _ in range(200):
+            which = np.random.randint(4)
+            start, size = np.random.randint(60), np.random.randint(1, 10)
+            if which == 0:
+                param_index.add(one, np.r_[start:start+size])
+                dense.update(range(start, start+size))
+            elif which == 1:
+                param_index.remove(one, np.r_[start:start+size])
+                dense.difference_update(range(start, start+size))
+            elif which == 2:
+                param_index.shift_right(start, size)
+                dense = set(i + size if i >= start else i for i in dense)
+            else:
+                param_index.shift_left(start, size)
+                dense = set(i - size if i >= start else i for i in dense if not (start <= i < start+size))
+            self.assertListEqual(param_index[one].tolist(), sorted(dense))
+
+    def test_view_cache(self):
+        three_local = self.view[three]
+        self.assertIs(self.view[three], three_local)
+        self.assertListEqual(three_local.tolist(), [0, 2, 5])
+        version = self.param_index._version
+        self.param_index.add(three, [3])
+        self.assertGreater(self.param_index._version, version)
+        self.assertListEqual(self.view[three].tolist(), [0, 1, 2, 5])
+        view2 = ParameterIndexOperationsView(self.view, 1, 3)
+        self.assertListEqual(view2[three].tolist(), [0, 1])
+        self.param_index.remove(three, [3])
+        self.assertListEqual(view2[three].tolist(), [1])
+        self.assertEqual(view2.size, 3)
+
+    def test_read_only(self):
+        for index in (self.param_index, self.view):
+            ind = index[three]
+            self.assertFalse(ind.flags.writeable)
+            self.assertRaises(ValueError, ind.__setitem__, 0, 1)
+            ind = ind.copy()
+            ind[0] = 1
+            self.assertNotEqual(index[three][0], 1)
+
+    def test_unpickle_dense(self):
+        param_index = ParameterIndexOperations.__new__(ParameterIndexOperations)
+        param_index.__setstate__(dict(_properties={one:np.array([3,9]), two:np.array([], dtype=int)}))
+        self.assertListEqual(param_index[one].tolist(), [3,9])
+        self.assertListEqual(param_index.properties(), [one])
+
+    def test_properties_for_against_dense(self):
+        np.random.seed(4321)
+        param_index = ParameterIndexOperations()
+        for prop in [one, two, three]:
+            param_index.add(prop, np.unique(np.random.randint(0, 100, 40)))
+        index = np.random.randint(0, 110, 60)
+        expected = [[prop for prop in param_index.properties() if i in param_index[prop]] for i in index]
+        self.assertListEqual(param_index.properties_for(index).tolist(), expected)
+        prop_dict = param_index.properties_dict_for(index)
+        for prop in param_index.properties():
+            self.assertListEqual(prop_dict[prop].tolist(), [i for i in index if i in param_index[prop]])
+
+    def test_properties_for_many_properties(self):
+        # more properties than fit into one integer code per element:
+        np.random.seed(1234)
+        param_index = ParameterIndexOperations()
+        for prop in range(70):
+            param_index.add(prop, np.unique(np.random.randint(0, 30, 10)))
+        index = np.random.randint(0, 35, 50)
+        expected = [[prop for prop in param_index.properties() if i in param_index[prop]] for i in index]
+        self.assertListEqual(param_index.properties_for(index).tolist(), expected)
+
     def test_print(self):
         print(self.param_index)
         print(self.view)
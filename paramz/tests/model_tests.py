@@ -125,6 +125,22 @@ class ModelTest(unittest.TestCase):
         np.testing.assert_array_less(self.testmodel.gradient, np.ones(self.testmodel.size)*1e-2)
         # self.assertDictEqual(self.testmodel.optimization_runs[-1].__getstate__(), {})
 
+    def test_optimize_native_bounds(self):
+        self.testmodel.kern.lengthscale.constrain_bounded(.1, 1)
+        self.testmodel.likelihood.fix()
+        self.testmodel._native_bounds_ = True
+        self.assertListEqual(self.testmodel.optimizer_bounds(), [(.1, 1.), (transformations.epsilon, None)])
+        self.testmodel._native_bounds_ = False
+        self.assertListEqual(self.testmodel.optimizer_bounds(), [(None, None)]*2)
+        for optimizer in ['lbfgsb', 'tnc']:
+            self.testmodel.kern[:] = .5
+            opt = self.testmodel.optimize(optimizer, native_bounds=True)
+            self.assertFalse(self.testmodel._native_bounds_)
+            # the optimum lies on the bounds:
+            np.testing.assert_allclose(self.testmodel.kern.lengthscale, .1)
+            np.testing.assert_array_less(self.testmodel.kern.variance, 1e-6)
+            np.testing.assert_array_equal(opt.x_opt, self.testmodel.optimizer_array)
+
     def test_optimize_rprop(self):
         try:
             import climin
@@ -220,6 +236,76 @@ class ModelTest(unittest.TestCase):
         self.assertListEqual(self.testmodel._raveled_index_for(self.testmodel['.*variance']).tolist(), [1, 2])
         self.assertListEqual(self.testmodel.kern.lengthscale._raveled_index_for(None).tolist(), [0])
 
+    def test_raveled_index_slices(self):
+        p = Param('p', np.random.rand(4, 5, 3))
+        for s in [np.s_[:], np.s_[1], np.s_[1:3], np.s_[::-1, 2], np.s_[[0, 2], :, 1], np.s_[p.values > .5],
+                  np.s_[..., 1], np.s_[1, ..., ::2], np.s_[:, [1, 3], [0, 2]], np.s_[-1]]:
+            ravi = p[s]._raveled_index()
+            np.testing.assert_array_equal(p.values.flat[ravi], p.values[s].flat)
+        view = p[1:3]
+        self.assertIs(view._raveled_index(), view._raveled_index())
+        self.assertFalse(view._raveled_index().flags.writeable)
+
+    def test_indices(self):
+        p = Param('p', np.random.rand(12, 3))
+        ind = p[[0, 10], 1:]._indices()
+        self.assertEqual(len(ind), 4)
+        np.testing.assert_array_equal(ind, [[0, 1], [0, 2], [10, 1], [10, 2]])
+        self.assertListEqual(ind.strings(), [str(i) for i in np.asarray(ind)])
+        self.assertListEqual(p[11:, 2]._indices().strings(), ['[11  2]'])
+        self.assertEqual(len(p[:0]._indices().strings()), 0)
+
+    def test_view_metadata(self):
+        p = Param('p', np.random.rand(4, 3))
+        m = Parameterized('m')
+        p = m.link_parameter(p)
+        v = p[1:3]
+        self.assertIs(v._meta_, p._meta_)
+        self.assertIs(v._parent_, m)
+        self.assertIs(v._original_, p)
+        p.name = 'q'
+        self.assertEqual(v.name, 'q')
+        # the gradient of a view is a view on the gradient of the param:
+        v.gradient[:] = 5
+        np.testing.assert_array_equal(m.gradient.reshape(4, 3)[1:3], 5)
+        np.testing.assert_array_equal(v[0].gradient, 5)
+        c = p.copy()
+        self.assertIsNot(c._meta_, p._meta_)
+        self.assertIs(c._original_, c)
+        self.assertIsNone(c._parent_)
+        self.assertEqual(p._parent_, m)
+
+    def test_set_dtype(self):
+        m = self.testmodel
+        values = m.param_array.copy()
+        m.kern.set_dtype(np.float32)
+        for a in [m.param_array, m.gradient, m.kern.param_array, m.kern.lengthscale,
+                  m.kern.lengthscale.gradient, m.optimizer_array]:
+            self.assertEqual(a.dtype, np.float32)
+        self.assertTrue(np.shares_memory(m.kern.lengthscale, m.param_array))
+        np.testing.assert_allclose(m.param_array, values, rtol=1e-6)
+        # batches get transformed in the dtype of the parameters:
+        X = np.tile(m.optimizer_array, (3, 1))
+        P = m.transform_batch(X)
+        self.assertEqual(P.dtype, np.float32)
+        self.assertEqual(m.untransform_batch(P).dtype, np.float32)
+        np.testing.assert_allclose(P, np.tile(m.param_array, (3, 1)), rtol=1e-5)
+        # the optimizer sees double precision:
+        self.assertEqual(m._grads(m.optimizer_array).dtype, np.float64)
+        # the default step of the gradient check fits the resolution of float32:
+        self.assertTrue(m.checkgrad())
+        self.assertTrue(m.checkgrad(verbose=1))
+        self.assertFalse(m.checkgrad(step=1e-6))
+        m.optimize('lbfgsb', max_iters=10)
+        # new parameters get converted:
+        p = m.link_parameter(Param('p', np.ones(3)))
+        self.assertIs(m.p, p)
+        self.assertEqual(p.dtype, np.float32)
+        self.assertTrue(np.shares_memory(p, m.param_array))
+        m.set_dtype(np.float64)
+        self.assertEqual(m.p.dtype, np.float64)
+        self.assertEqual(m.gradient.dtype, np.float64)
+
     def test_constraints_testmodel(self):
         self.testmodel['.*rbf'].constrain_negative()
         self.assertListEqual(self.testmodel.constraints[transformations.NegativeLogexp()].tolist(), [0,1])
@@ -386,6 +472,79 @@ class ModelTest(unittest.TestCase):
         # lik bounded
         np.testing.assert_array_equal(self.testmodel.constraints[transformations.Logistic(0,1)], [2])
 
+    def test_transform_plan(self):
+        plan = self.testmodel._transform_plan()
+        self.assertIs(plan, self.testmodel._transform_plan())
+        self.assertIsNone(plan.free_index)
+        # all three parameters are one block of Logexp:
+        self.assertEqual(len(plan.transforms), 1)
+        self.assertEqual(plan.transforms[0][1], slice(0, 3))
+
+        self.testmodel.kern.variance.fix()
+        self.testmodel.kern.lengthscale.constrain_bounded(0, 1)
+        plan = self.testmodel._transform_plan()
+        np.testing.assert_array_equal(plan.free_index, [0, 2])
+        transforms = dict(plan.transforms)
+        self.assertEqual(transforms[transformations.Logistic(0, 1)], slice(0, 1))
+        self.assertEqual(transforms[transformations.Logexp()], slice(2, 3))
+
+        x = self.testmodel.optimizer_array.copy()
+        self.assertEqual(x.size, 2)
+        self.testmodel.optimizer_array = x
+        np.testing.assert_allclose(self.testmodel.optimizer_array, x)
+        g = self.testmodel._transform_gradients(np.ones(3))
+        np.testing.assert_allclose(g, np.r_[transformations.Logistic(0, 1).gradfactor(self.testmodel.kern.lengthscale.values, np.ones(1)),
+                                            transformations.Logexp().gradfactor(self.testmodel.likelihood.variance.values, np.ones(1))])
+
+    def test_transform_batch(self):
+        self.testmodel.kern.lengthscale.constrain_bounded(0, 1)
+        self.testmodel.kern.variance.fix()
+        param_array = self.testmodel.param_array.copy()
+        X = np.random.normal(0, 3, (5, 2))
+        P = self.testmodel.transform_batch(X)
+        self.assertEqual(P.shape, (5, 3))
+        np.testing.assert_array_equal(self.testmodel.param_array, param_array)
+        for x, p in zip(X, P):
+            self.testmodel.optimizer_array = x
+            np.testing.assert_allclose(self.testmodel.param_array, p)
+        np.testing.assert_allclose(self.testmodel.untransform_batch(P), X)
+        np.testing.assert_allclose(self.testmodel.untransform_batch(P[0]), X[:1])
+        self.assertRaises(ValueError, self.testmodel.transform_batch, np.ones((2, 3)))
+        self.assertRaises(ValueError, self.testmodel.untransform_batch, np.ones((2, 2)))
+
+    def test_optimizer_array_partial_update(self):
+        m = self.testmodel
+        m.likelihood.variance.constrain_bounded(0, 1)
+        m.kern.variance.fix()
+        m.optimizer_array
+        self.assertEqual(m._optimizer_copy_dirty_runs().size, 0)
+        m._partial_transform_fraction = .5
+        m.likelihood.variance[:] = .3
+        self.assertFalse(m._optimizer_copy_transformed)
+        np.testing.assert_array_equal(m._optimizer_copy_dirty_runs(), [[2, 3]])
+        np.testing.assert_allclose(m.optimizer_array, m.untransform_batch(m.param_array)[0])
+        np.testing.assert_allclose(m.optimizer_array[-1], transformations.Logistic(0, 1).finv(np.array([.3])))
+        # too many changes transform everything:
+        m.kern.lengthscale[:] = 2.
+        m.likelihood.variance[:] = .4
+        self.assertIsNone(m._optimizer_copy_dirty_runs())
+        np.testing.assert_allclose(m.optimizer_array, m.untransform_batch(m.param_array)[0])
+        m.optimizer_array = m.optimizer_array * 0
+        self.assertIsNone(m._optimizer_copy_dirty_runs())
+
+    def test_optimizer_array_buffers(self):
+        m = self.testmodel
+        m.kern.lengthscale[::2].constrain_bounded(.1, 10)
+        m.kern.variance.fix()
+        x = m.optimizer_array.copy()
+        opt = m.optimizer_array
+        # the free elements are gathered into the same preallocated buffer:
+        self.assertIs(m.optimizer_array, opt)
+        m.optimizer_array = x + .1
+        np.testing.assert_allclose(m.optimizer_array, x + .1)
+        self.assertIs(m.optimizer_array, opt)
+        np.testing.assert_allclose(m.optimizer_array, m.untransform_batch(m.param_array)[0])
+
     def test_caching_offswitch(self):
         self.assertEqual(len(self.testmodel.kern.cache), 1)
         [self.assertEqual(len(c.cached_outputs), 1) for c in self.testmodel.kern.cache.values()]
@@ -423,6 +582,36 @@ class ModelTest(unittest.TestCase):
         self.assertEqual(self.testmodel.num_params, 2)
         self.assertEqual(self.testmodel.kern.lengthscale.num_params, 0)
 
+    def test_printing_summary(self):
+        from paramz.param import __print_summary_size__, __print_threshold__
+        try:
+            from StringIO import StringIO
+        except ImportError:
+            from io import StringIO
+        p = Param('X', np.arange(__print_summary_size__ + 1.))
+        lines = str(p).split('\n')
+        # header, head, '...', tail and the statistics:
+        self.assertEqual(len(lines), 2*__print_threshold__ + 3)
+        self.assertIn('...', lines[__print_threshold__ + 1])
+        self.assertIn('[{}]'.format(__print_summary_size__), lines[-2])
+        self.assertIn('mean {:g}'.format(__print_summary_size__ / 2.), lines[-1])
+        self.assertIn('...', p._repr_html_())
+        self.assertEqual(len(p.__str__(full=True).split('\n')), p.size + 1)
+        f = StringIO()
+        p.print_table(f)
+        self.assertEqual(f.getvalue(), p.__str__(full=True, VT100=False) + '\n')
+        self.assertEqual(len(str(p[:5]).split('\n')), 6)
+        f = StringIO()
+        self.testmodel.print_table(f)
+        self.assertEqual(f.getvalue(), self.testmodel.__str__(VT100=False) + '\n')
+        f = StringIO()
+        self.testmodel.kern.print_table(f, header=False)
+        self.assertEqual(f.getvalue(), self.testmodel.kern.__str__(header=False, VT100=False) + '\n')
+        from paramz.param import __precision__
+        p = Param('X', np.array([1.123456789, -2.5, 1e10], dtype=np.float32))
+        for line, v in zip(p.__str__(VT100=False).split('\n')[1:], p.values.tolist()):
+            self.assertIn('%.{}f'.format(__precision__) % v, line)
+
     def test_hierarchy_error(self):
         self.assertRaises(HierarchyError, self.testmodel.link_parameter, self.testmodel.parameters[0])
         p2 = P('Gaussian_noise', variance=Param('variance', np.random.uniform(0.1, 0.5), transformations.Logexp()))
@@ -25,12 +25,13 @@ class TestMisc(unittest.TestCase):
         ints = np.array(range(10))
         self.assertEqual(ints.dtype, np.int_)
         floats = np.arange(0,5,.5)
-        self.assertEqual(floats.dtype, np.float_)
+        self.assertEqual(floats.dtype, np.float64)
         strings = np.array(list('testing'))
         self.assertEqual(strings.dtype.type, np.str_)
 
-        self.assertEqual(ObsAr(ints).dtype, np.float_)
-        self.assertEqual(ObsAr(floats).dtype, np.float_)
+        self.assertEqual(ObsAr(ints).dtype, np.float64)
+        self.assertEqual(ObsAr(floats).dtype, np.float64)
+        self.assertEqual(ObsAr(floats.astype(np.float32)).dtype, np.float32)
         self.assertEqual(ObsAr(strings).dtype.type, np.str_)
 
 
@@ -51,6 +52,8 @@ class Test(unittest.TestCase):
 
         self.parent.link_parameter(self.par)
         self.parent.link_parameter(self.par2)
+        # the parameter got replaced by a view of the memory of the hierarchy:
+        self.p = self.par.test_parameter
 
         self._observer_triggered = None
         self._trigger_count = 0
@@ -4,12 +4,15 @@ Created on Feb 13, 2014
 @author: maxzwiessele
 '''
 import unittest
+import re
+import warnings
 import numpy as np
 
 from paramz.core.index_operations import ParameterIndexOperations
 from paramz.core.nameable import adjust_name_for_printing
 from paramz.core import HierarchyError
 from paramz import transformations
+from paramz.transformations import __fixed__
 from paramz.parameterized import Parameterized
 from paramz.param import Param
 from paramz.model import Model
@@ -74,6 +77,8 @@ class ParameterizedTest(unittest.TestCase):
 
         self.test1.link_parameter(self.test1.kern)
         self.test1.link_parameter(self.param, 0)
+        # the param got replaced by a view of the memory of test1:
+        self.param = self.test1.param
 
         # print self.test1:
         #=============================================================================
@@ -123,6 +128,8 @@ class ParameterizedTest(unittest.TestCase):
         self.test1.kern.rbf.lengthscale.fix()
         self.assertSequenceEqual(self.test1.parameter_names_flat().tolist(), ['test_parameterized.add.rbf.variance', 'test_parameterized.add.white.variance'])
         self.assertEqual(self.test1.parameter_names_flat(include_fixed=True).size, self.test1.size)
+        # below the highest parent as well:
+        self.assertSequenceEqual(self.test1.kern.parameter_names_flat().tolist(), ['test_parameterized.add.rbf.variance', 'test_parameterized.add.white.variance'])
 
     def test_num_params(self):
         self.assertEqual(self.test1.num_params, 2)
@@ -208,6 +215,24 @@ class ParameterizedTest(unittest.TestCase):
         self.assertTrue(self.test1.is_fixed)
         self.assertListEqual(self.test1._fixes_.tolist(),[transformations.FIXED]*self.test1.size)
 
+    def test_transformed_index(self):
+        self.param[2:5].fix()
+        self.param[7].fix()
+        self.white.fix()
+        fixes = self.test1._fixes_
+        transformed = (np.r_[:self.test1.size] - (~fixes).cumsum())
+        for p in [self.param, self.rbf, self.white, self.param[3:9], self.test1.kern]:
+            ravi = self.test1._raveled_index_for(p)
+            np.testing.assert_array_equal(self.test1._raveled_index_for_transformed(p), transformed[ravi[fixes[ravi]]])
+        free = np.flatnonzero(fixes)
+        np.testing.assert_array_equal(self.test1._transformed_index(free), np.arange(free.size))
+        np.testing.assert_array_equal(self.test1._untransformed_index(np.arange(free.size)), free)
+        self.param.unfix()
+        np.testing.assert_array_equal(self.test1._untransformed_index([0, 51]), [0, 51])
+        self.param[0, :2].fix()
+        np.testing.assert_array_equal(self.test1._untransformed_index([0, 49]), [2, 51])
+        np.testing.assert_array_equal(self.test1._transformed_index([0, 2, 51, 52]), [0, 49])
+
     def test_remove_parameter(self):
         self.white.fix()
         self.test1.kern.unlink_parameter(self.white)
@@ -296,6 +321,356 @@ class ParameterizedTest(unittest.TestCase):
         self.assertListEqual(self.test1.constraints[transformations.Logistic(0,1)].tolist(), list(range(self.param.size)))
         self.assertListEqual(self.test1.constraints[transformations.Logexp(0,1)].tolist(), np.r_[50, 53:55].tolist())
 
+    def test_relative_views(self):
+        self.assertEqual(self.white.constraints._relative_offset, self.rbf.size)
+        self.assertIs(self.white.constraints._parent_view, self.test1.kern.constraints)
+        new = Param("NEW", np.random.rand(2), transformations.NegativeLogexp())
+        new = self.test1.kern.rbf.link_parameter(new, 1)
+        # only the offsets of the following blocks move:
+        self.assertEqual(self.white.constraints._relative_offset, self.rbf.size)
+        self.assertEqual(self.white.constraints._offset, self.param.size+self.rbf.size)
+        self.assertEqual(self.white.variance.constraints._offset, self.param.size+self.rbf.size)
+        self.assertListEqual(self.white.constraints[transformations.Logexp()].tolist(), [0])
+        self.assertListEqual(self.rbf.lengthscale.constraints[transformations.Logexp()].tolist(), [0])
+        self.assertListEqual(self.rbf.constraints[transformations.NegativeLogexp()].tolist(), [1, 2])
+        self.test1.kern.rbf.unlink_parameter(new)
+        self.assertEqual(self.white.variance.constraints._offset, self.param.size+self.rbf.size)
+        self.assertListEqual(self.test1.constraints[transformations.Logexp()].tolist(), np.r_[50:53].tolist())
+
+    def test_offsets(self):
+        def check(parent):
+            self.assertListEqual(parent._parameter_offsets(), np.r_[0, np.cumsum([p.size for p in parent.parameters])].tolist())
+        self.assertListEqual(self.test1._parameter_offsets(), [0, 50, 53])
+        self.assertEqual(self.test1._offset_for(self.white.variance), 52)
+        new = Param("NEW", np.random.rand(2))
+        new = self.test1.kern.rbf.link_parameter(new, 1)
+        [check(p) for p in (self.test1, self.test1.kern, self.rbf)]
+        self.assertEqual(self.test1._offset_for(self.white.variance), 54)
+        self.assertEqual(self.test1._offset_for(new), 51)
+        self.test1.unlink_parameter(self.param)
+        [check(p) for p in (self.test1, self.test1.kern, self.rbf)]
+        self.assertEqual(self.test1._offset_for(self.white.variance), 4)
+        # new got moved into the new memory of test1:
+        new = self.rbf.parameters[1]
+        self.test1.kern.rbf.unlink_parameter(new)
+        [check(p) for p in (self.test1, self.test1.kern, self.rbf)]
+        self.assertEqual(self.test1._offset_for(self.white.variance), 2)
+
+    def test_link_parameters(self):
+        new = [Param('new', np.random.rand(2)), Param('new', np.random.rand(3)),
+               Param('other', np.random.rand(1), transformations.Logexp())]
+        values = np.concatenate([p.values for p in new])
+        self.test1.link_parameters(*new)
+        # the linked params got replaced by views of the memory of test1,
+        # the ones given are outdated:
+        self.assertFalse(new[2].flags.writeable)
+        self.assertIs(new[2]._original_, self.test1.parameters[4])
+        new = self.test1.parameters[2:]
+        self.assertListEqual(self.test1.parameter_names(recursive=False), ['param', 'add', 'new', 'new_1', 'other'])
+        self.assertListEqual([p._parent_index_ for p in self.test1.parameters], [0, 1, 2, 3, 4])
+        self.assertListEqual(self.test1._parameter_offsets(), [0, 50, 53, 55, 58, 59])
+        np.testing.assert_array_equal(self.test1.param_array[53:], values)
+        self.assertTrue(np.shares_memory(new[2], self.test1.param_array))
+        self.assertIs(self.test1.other, new[2])
+        self.assertIs(self.test1.new_1, new[1])
+        self.assertListEqual(self.test1.constraints[transformations.Logexp()].tolist(), [50, 51, 52, 58])
+        self.assertIs(new[0]._highest_parent_, self.test1)
+        self.assertRaises(HierarchyError, self.test1.link_parameters, new[0])
+        p = Param('p', 1)
+        self.assertRaises(HierarchyError, self.test1.kern.link_parameters, p, p)
+
+    def test_parameter_arena(self):
+        values = self.test1.param_array.copy()
+        arena = self.test1.param_array.base
+        self.assertIsNotNone(arena)
+        self.assertIs(self.test1.gradient.base, arena)
+        self.assertEqual(arena.shape[0], 2)
+        self.assertGreaterEqual(arena.shape[1], self.test1.size)
+        for p in (self.test1.kern, self.rbf, self.white, self.param, self.white.variance):
+            self.assertTrue(np.shares_memory(p.param_array, arena))
+            self.assertTrue(np.shares_memory(p.gradient_full, arena))
+        leaves, nodes = self.test1._parameter_layout()
+        self.assertListEqual([(p.name, start) for p, start in leaves], [('param', 0), ('variance', 50), ('lengthscale', 51), ('variance', 52)])
+        self.assertListEqual([(p.name, start) for p, start in nodes], [('add', 50), ('rbf', 50), ('white', 52)])
+        # connecting again does not move anything:
+        self.test1._connect_parameters()
+        self.assertIs(self.test1.param_array.base, arena)
+        self.rbf.link_parameter(Param('new', [3.]), 0)
+        np.testing.assert_array_equal(self.test1.param_array, np.r_[values[:50], 3., values[50:]])
+        self.assertTrue(np.shares_memory(self.white.variance, self.test1.param_array))
+        self.white.variance.gradient = 4.
+        self.assertEqual(self.test1.gradient[53], 4.)
+
+    def test_rebind_param(self):
+        from paramz.core.parameter_core import _rebind_param
+        p = self.param
+        changes = []
+        self.test1.add_observer(self, lambda me, which: changes.append(which))
+        memory = np.arange(100.).reshape(2, 50)
+        q = _rebind_param(p, memory[0], memory[1])
+        # q took the place of p in the hierarchy:
+        self.assertIs(self.test1.parameters[0], q)
+        self.assertIs(self.test1.param, q)
+        self.assertIs(q._original_, q)
+        self.assertIs(q._parent_, self.test1)
+        self.assertEqual(q.shape, (10, 5))
+        self.assertTrue(np.shares_memory(q, memory[0]))
+        self.assertTrue(np.shares_memory(q.gradient, memory[1]))
+        np.testing.assert_array_equal(q.constraints[transformations.Logistic(0, 1)], range(50))
+        q[0, 0] = 3.
+        self.assertEqual(memory[0, 0], 3.)
+        self.assertIs(changes[-1], q)
+        # p is outdated:
+        self.assertRaises(ValueError, p.__setitem__, (0, 0), 1.)
+        # laying out the hierarchy copies q back in, without a DeprecationWarning:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            self.test1.link_parameter(Param('new', np.ones((3, 2))))
+            self.test1.kern.unlink_parameter(self.white)
+            self.test1.param.append_rows(np.ones((2, 5)))
+        self.assertEqual(self.test1.param_array[0], 3.)
+        for leaf in (self.test1.param, self.rbf.variance, self.test1.new):
+            self.assertTrue(np.shares_memory(leaf, self.test1.param_array))
+            self.assertTrue(np.shares_memory(leaf.gradient, self.test1.gradient))
+
+    def test_unlink_names(self):
+        spaced, underscored = Param('a b', [1.]), Param('a_b', [2.])
+        y, y_1 = Param('y', [3.]), Param('y', [4.])
+        kern = Parameterized('kern')
+        kern.link_parameters(spaced, underscored, y, y_1)
+        self.test1.link_parameter(kern)
+        spaced, underscored, y, y_1 = kern.parameters
+        self.assertListEqual([p.name for p in kern.parameters], ['a b', 'a_b', 'y', 'y_1'])
+        self.assertIs(kern.a_b, spaced)
+        # the freed name gets taken by the child printed the same way:
+        kern.unlink_parameter(spaced)
+        # (the others got moved into new memory)
+        underscored, y, y_1 = kern.parameters
+        self.assertIs(kern.a_b, underscored)
+        kern.unlink_parameter(y)
+        self.assertIs(kern.y_1, kern.parameters[-1])
+        self.assertNotIn('y', kern.__dict__)
+
+    def test_rename_in_arena(self):
+        arena = self.test1.param_array.base
+        self.rbf.variance.name = 'var'
+        self.white.name = 'noise'
+        self.assertIs(self.test1.param_array.base, arena)
+        for p in (self.rbf.var, self.rbf.lengthscale, self.white.variance, self.param):
+            self.assertTrue(np.shares_memory(p, self.test1.param_array))
+            self.assertTrue(np.shares_memory(p.gradient_full, self.test1.gradient_full))
+        self.rbf.var[:] = 5.
+        self.assertEqual(self.test1.param_array[50], 5.)
+        self.test1.optimizer_array = self.test1.optimizer_array + 0
+        self.assertAlmostEqual(float(self.rbf.var), 5.)
+
+    def test_unlink_in_arena(self):
+        extra = self.test1.kern.link_parameter(Param('extra', np.arange(5.)))
+        values = self.test1.param_array.copy()
+        self.test1.gradient = np.arange(self.test1.size)
+        arena = self.test1.param_array.base
+        rbf = self.test1.kern.rbf
+        self.test1.kern.unlink_parameter(rbf)
+        # the unlinked param keeps its memory, the others get a new arena:
+        self.assertIsNot(self.test1.param_array.base, arena)
+        self.assertEqual(self.test1.param_array.base.shape, (2, self.test1.size))
+        np.testing.assert_array_equal(self.test1.param_array, np.r_[values[:50], values[52:]])
+        np.testing.assert_array_equal(self.test1.gradient, np.r_[np.arange(50), np.arange(52, 58)])
+        extra = self.test1.kern.parameters[-1]
+        np.testing.assert_array_equal(extra, np.arange(5.))
+        self.assertTrue(np.shares_memory(extra, self.test1.param_array))
+        np.testing.assert_array_equal(rbf.param_array, values[50:52])
+        self.assertTrue(np.shares_memory(rbf.variance, rbf.param_array))
+        self.assertFalse(np.shares_memory(rbf.param_array, self.test1.param_array))
+        self.test1.param_array[:] = 0
+        np.testing.assert_array_equal(rbf.param_array, values[50:52])
+        rbf.variance[:] = 2.
+        self.assertEqual(rbf.param_array[0], 2.)
+        self.test1.kern.white.variance.gradient = 3.
+        self.assertEqual(self.test1.gradient[50], 3.)
+
+    def test_resize(self):
+        values = self.test1.param_array.copy()
+        self.test1.gradient = np.arange(self.test1.size)
+        self.param[2:4, 1].fix(warning=False)
+        arena = self.test1.param_array.base
+        param = self.param.append_rows(np.full((2, 5), .5))
+        # the resized param replaces the old one:
+        self.assertIs(self.test1.param, param)
+        self.assertFalse(self.param.flags.writeable)
+        self.assertEqual(param.shape, (12, 5))
+        self.assertEqual(self.test1.size, 63)
+        self.assertIs(self.test1.param_array.base, arena)
+        np.testing.assert_array_equal(self.test1.param_array, np.r_[values[:50], np.full(10, .5), values[50:]])
+        np.testing.assert_array_equal(self.test1.gradient, np.r_[np.arange(50), np.zeros(10), np.arange(50, 53)])
+        self.assertTrue(np.shares_memory(self.white.variance, arena))
+        # the constraint of the whole param and the fixes of the rows stay:
+        np.testing.assert_array_equal(param.constraints[transformations.Logistic(0, 1)], range(60))
+        np.testing.assert_array_equal(param.constraints[__fixed__], [11, 16])
+        np.testing.assert_array_equal(self.test1.constraints[transformations.Logexp()], [60, 61, 62])
+        np.testing.assert_array_equal(np.nonzero(~self.test1._fixes_)[0], [11, 16])
+        self.assertEqual(self.test1.optimizer_array.size, 61)
+        np.testing.assert_array_equal(param[10:], .5)
+        param = param.resize((3, 5))
+        np.testing.assert_array_equal(self.test1.param_array, np.r_[values[:15], values[50:]])
+        np.testing.assert_array_equal(self.test1.constraints[transformations.Logexp()], [15, 16, 17])
+        self.white.variance.gradient = 2.
+        self.assertEqual(self.test1.gradient[17], 2.)
+        self.assertRaises(ValueError, param.resize, (3, 4))
+        self.assertRaises(ValueError, param[1:].resize, (5, 5))
+        p = Param('p', [1., 2.])
+        p.constrain_positive(warning=False)
+        for i in range(3):
+            p = p.append_rows([3. + i])
+        np.testing.assert_array_equal(p, [1, 2, 3, 4, 5])
+        np.testing.assert_array_equal(p.constraints[transformations.Logexp()], range(5))
+
+    def test_resize_partial_constraints(self):
+        m = Parameterized('m')
+        k = Parameterized('k')
+        a, d = Param('a', [1., -2., 3.]), Param('d', [4., 5.])
+        b, c = Param('b', np.arange(1., 9.).reshape(4, 2)), Param('c', [.1, .2, .3])
+        k.link_parameters(b, c)
+        m.link_parameters(a, k, d)
+        b, c = k.b, k.c
+        m.a[1:2].constrain_negative(warning=False)
+        b[1:3].constrain_positive(warning=False)
+        b[0:1, 1].fix(warning=False)
+        c[:1].constrain_bounded(0, 1, warning=False)
+        c[2:].fix(warning=False)
+        m.d.constrain_positive(warning=False)
+        values = m.param_array.copy()
+        Logexp, Logistic = transformations.Logexp(), transformations.Logistic(0, 1)
+        def check(rows, logexp, fixed, bounded):
+            self.assertEqual(m.size, 3 + 2 * rows + 5)
+            np.testing.assert_array_equal(m.constraints[transformations.NegativeLogexp()], [1])
+            np.testing.assert_array_equal(m.constraints[Logexp], logexp)
+            np.testing.assert_array_equal(m.constraints[__fixed__], fixed)
+            np.testing.assert_array_equal(m.constraints[Logistic], bounded)
+            np.testing.assert_array_equal(np.nonzero(~m._fixes_)[0], fixed)
+            self.assertEqual(m.optimizer_array.size, m.size - len(fixed))
+            # the other parameters see their own constraints at the same place:
+            np.testing.assert_array_equal(m.k.c.constraints[Logistic], [0])
+            np.testing.assert_array_equal(m.k.c.constraints[__fixed__], [2])
+            np.testing.assert_array_equal(m.d.constraints[Logexp], [0, 1])
+            np.testing.assert_array_equal(m.k.constraints[Logistic], [2 * rows])
+            np.testing.assert_allclose(m.param_array[:3], values[:3])
+            np.testing.assert_allclose(m.param_array[-5:], values[-5:])
+        # only the constrained rows of b stay constrained, the others shift:
+        b = b.resize((6, 2))
+        self.assertIs(m.k.b, b)
+        np.testing.assert_array_equal(b.constraints[Logexp], [2, 3, 4, 5])
+        np.testing.assert_array_equal(b.constraints[__fixed__], [1])
+        check(6, [5, 6, 7, 8, 18, 19], [4, 17], [15])
+        np.testing.assert_array_equal(b[4:], 0)
+        m.optimizer_array = m.optimizer_array
+        np.testing.assert_allclose(m.param_array[:15], np.r_[values[:11], 0, 0, 0, 0])
+        # shrinking drops the constraints of the removed rows:
+        b = b.resize((1, 2))
+        np.testing.assert_array_equal(b.constraints[Logexp], [])
+        np.testing.assert_array_equal(b.constraints[__fixed__], [1])
+        check(1, [8, 9], [4, 7], [5])
+        b = b.append_rows([[7., 8.]])
+        np.testing.assert_array_equal(b.constraints[Logexp], [])
+        check(2, [10, 11], [4, 9], [7])
+
+    def test_name_index(self):
+        def traverse_grep(node, regexp):
+            found = []
+            def visit(p):
+                if p is not node and re.match(regexp, p.hierarchy_name().partition('.')[2]):
+                    found.append(p)
+            node.traverse(visit)
+            return found
+        patterns = ['add.rbf.variance', 'add', '.*variance', 'add\\.', 'ad+', 'param|add.white', '(?i)ADD', '']
+        for node in (self.test1, self.test1.kern, self.rbf):
+            for pattern in patterns:
+                self.assertListEqual(node.grep_param_names(pattern), traverse_grep(node, pattern))
+        self.assertIs(self.test1['add.rbf.variance'], self.rbf.variance)
+        # the index follows renaming, unlinking and linking:
+        self.rbf.name = 'se'
+        self.assertIs(self.test1['add.se.variance'], self.rbf.variance)
+        self.assertListEqual(self.test1.grep_param_names('add.rbf'), [])
+        self.test1.kern.unlink_parameter(self.white)
+        self.assertListEqual(self.test1.grep_param_names('add.white'), [])
+        self.assertIs(self.white['variance'], self.white.variance)
+        self.test1.link_parameter(self.white)
+        self.assertIs(self.test1['white.variance'], self.white.variance)
+        self.assertListEqual(self.test1.grep_param_names('.*variance'), traverse_grep(self.test1, '.*variance'))
+
+    def test_highest_parent(self):
+        self.assertIs(self.white.variance._highest_parent_, self.test1)
+        self.assertIs(self.white.__dict__['_root_'], self.test1)
+        self.test1.kern.unlink_parameter(self.white)
+        self.assertIs(self.white.variance._highest_parent_, self.white)
+        top = Parameterized('top')
+        top.link_parameter(self.test1)
+        self.assertIs(self.rbf.variance._highest_parent_, top)
+        self.assertIs(self.param[0:2]._highest_parent_, top)
+        self.test1.kern.link_parameter(self.white)
+        self.assertIs(self.white.variance._highest_parent_, top)
+        top.unlink_parameter(self.test1)
+        self.assertIs(self.white.variance._highest_parent_, self.test1)
+        self.assertIs(self.test1.copy().kern.white.variance._highest_parent_._parent_, None)
+
+    def test_constrain_many(self):
+        other = self.test1.copy()
+        other.param[:2].fix(warning=False)
+        other.kern.rbf.variance.constrain_negative(warning=False)
+        other.kern.white.constrain_bounded(0, 2, warning=False)
+        other.param[1].constrain_bounded(-1, 1, warning=False)
+
+        self.test1.constrain_many([(self.param[:2], __fixed__),
+                                   ('.*rbf.variance', transformations.NegativeLogexp()),
+                                   (self.white, transformations.Logistic(0, 2)),
+                                   (self.param[1], transformations.Logistic(-1, 1))], warning=False)
+        self.assertDictEqual(dict((str(c), ind.tolist()) for c, ind in self.test1.constraints.items()),
+                             dict((str(c), ind.tolist()) for c, ind in other.constraints.items()))
+        np.testing.assert_array_equal(self.test1._fixes_, other._fixes_)
+        np.testing.assert_array_equal(self.test1.param_array, other.param_array)
+
+        self.test1.unfix_many([self.param])
+        self.assertIsNone(self.test1._fixes_)
+        self.test1.fix_many(['.*white', self.param[0]])
+        self.assertListEqual(self.test1.constraints[__fixed__].tolist(), [0, 1, 2, 3, 4, 52])
+        self.assertEqual(self.test1.optimizer_array.size, self.test1.size - 6)
+        self.assertRaises(AttributeError, self.test1.constrain_many, {'nothing': transformations.Logexp()})
+        self.assertRaises(ValueError, self.test1.constrain_many, [(self.param, 'positive')])
+        # nothing to do for no parameters:
+        fixed = self.test1.constraints[__fixed__].tolist()
+        self.test1.fix_many([])
+        self.assertListEqual(self.test1.unfix_many([], warning=False, trigger_parent=False).tolist(), [])
+        self.assertListEqual(self.test1.constraints[__fixed__].tolist(), fixed)
+
+    def test_param_concatenation_constrain(self):
+        self.test1['.*variance'].constrain_bounded(0, 3, warning=False)
+        self.assertListEqual(self.test1.constraints[transformations.Logistic(0, 3)].tolist(), [50, 52])
+        self.test1['.*variance'].fix()
+        self.assertListEqual(self.test1.constraints[__fixed__].tolist(), [50, 52])
+
+    def test_fix_values_update_once(self):
+        updates, notified = [], []
+        self.test1.parameters_changed = lambda: updates.append(1)
+        class Cache(object):
+            def on_change(self, me, which=None):
+                notified.append(me)
+        cache = Cache()
+        self.param.add_observer(cache, cache.on_change)
+        # fixing all parameters to a value updates the model once:
+        self.test1[''].fix(.3, warning=False)
+        self.assertEqual(len(updates), 1)
+        # caches of the parameters get told about the new values:
+        self.assertIs(notified[0], self.param)
+        np.testing.assert_array_equal(self.test1.param_array, .3)
+        self.assertEqual(self.test1.optimizer_array.size, 0)
+        self.test1.unfix_many([''])
+        del updates[:], notified[:]
+        self.test1.fix_many([self.param[2:], '.*lengthscale'], value=.5, warning=False)
+        self.assertEqual(len(updates), 1)
+        self.assertIs(notified[0]._original_, self.param)
+        np.testing.assert_array_equal(self.test1.param_array, np.r_[[.3] * 10, [.5] * 40, .3, .5, .3])
+        self.assertListEqual(self.test1.constraints[__fixed__].tolist(), list(range(10, 50)) + [51])
+
     def test_checkgrad_hierarchy_error(self):
         self.assertRaises(HierarchyError, self.test1.checkgrad)
         self.assertRaises(HierarchyError, self.test1.kern.white.checkgrad)
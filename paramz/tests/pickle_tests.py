@@ -40,7 +40,7 @@ class Test(ListDictTestCase):
             pickle.dump(pio, f)
             f.seek(0)
             pio2 = pickle.load(f)
-            self.assertListDictEquals(pio._properties, pio2._properties)
+            self.assertListDictEquals(dict(pio.items()), dict(pio2.items()))
 
         with tempfile.TemporaryFile('w+b') as f:
             pickle.dump(piov, f)
@@ -0,0 +1,123 @@
+# Copyright (c) 2014, Max Zwiessele
+# Licensed under the BSD 3-clause license (see LICENSE.txt)
+
+import unittest
+import numpy as np
+from .. import transformations
+from ..transformations import Logexp, Exponent, NegativeLogexp, NegativeExponent, Square, Logistic, _lim_val, _log_lim_val
+
+# The straight forward implementations of the transformations:
+def logexp_f(x):
+    return np.where(x>_lim_val, x, np.log1p(np.exp(np.clip(x, -_log_lim_val, _lim_val))))
+def logexp_finv(f):
+    return np.where(f>_lim_val, f, np.log(np.expm1(np.clip(f, 0, _lim_val+1))))
+def logexp_gradfactor(f, df):
+    return df*np.where(f>_lim_val, 1., -np.expm1(-f))
+def logistic_f(x, lower, upper):
+    return lower + (upper-lower) / (1. + np.exp(-np.maximum(x, -300.)))
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.r_[-800, -300, -50, -_lim_val, -1, -1e-5, 0, 1e-5, .5, 3, _lim_val-1e-8, _lim_val, _lim_val+1e-8, 50, 700]
+        self.logistic = Logistic(-2, 3)
+        self.reference = [
+            (Logexp(), logexp_f, logexp_finv, logexp_gradfactor),
+            (Exponent(), lambda x: np.exp(np.clip(x, -_lim_val, _lim_val)), np.log, lambda f, df: df*f),
+            (NegativeLogexp(), lambda x: -logexp_f(x), lambda f: logexp_finv(-f), lambda f, df: logexp_gradfactor(-f, -df)),
+            (NegativeExponent(), lambda x: -np.exp(np.clip(x, -_lim_val, _lim_val)), lambda f: np.log(-f), lambda f, df: df*f),
+            (Square(), np.square, np.sqrt, lambda f, df: df*2*np.sqrt(f)),
+            (self.logistic, lambda x: logistic_f(x, -2, 3),
+             lambda f: np.log(np.clip(f+2, 1e-10, np.inf) / np.clip(3-f, 1e-10, np.inf)),
+             lambda f, df: df*(f+2)*(3-f)/5.),
+            ]
+
+    def test_against_reference(self):
+        df = np.linspace(-1, 1, self.x.size)
+        for c, f, finv, gradfactor in self.reference:
+            fx = c.f(self.x)
+            np.testing.assert_allclose(fx, f(self.x), rtol=1e-14, err_msg=str(c))
+            np.testing.assert_allclose(c.finv(fx), finv(fx), rtol=1e-12, atol=1e-12, err_msg=str(c))
+            np.testing.assert_allclose(c.gradfactor(fx, df), gradfactor(fx, df), rtol=1e-14, err_msg=str(c))
+
+    def test_out(self):
+        df = np.linspace(-1, 1, self.x.size)
+        for c, _, _, _ in self.reference:
+            self.assertTrue(c.supports_out())
+            fx = c.f(self.x)
+            finv = c.finv(fx)
+            grad = c.gradfactor(fx, df)
+
+            out = np.empty_like(self.x)
+            self.assertIs(c.f(self.x, out=out), out)
+            np.testing.assert_array_equal(out, fx)
+            self.assertIs(c.finv(fx, out=out), out)
+            np.testing.assert_array_equal(out, finv)
+            self.assertIs(c.gradfactor(fx, df, out=out), out)
+            np.testing.assert_array_equal(out, grad)
+
+            # in place, with and without workspace:
+            for workspace in [None, np.empty_like(self.x)]:
+                out = self.x.copy()
+                c.f(out, out, workspace)
+                np.testing.assert_array_equal(out, fx)
+                c.finv(out, out, workspace)
+                np.testing.assert_array_equal(out, finv)
+                out = fx.copy()
+                c.gradfactor(out, df, out, workspace)
+                np.testing.assert_array_equal(out, grad)
+                out = df.copy()
+                c.gradfactor(fx, out, out, workspace)
+                np.testing.assert_array_equal(out, grad)
+
+    def test_roundtrip(self):
+        x = np.linspace(-10, 10, 41)
+        for c, _, _, _ in self.reference:
+            if not isinstance(c, Square):
+                np.testing.assert_allclose(c.finv(c.f(x)), x, atol=1e-10, err_msg=str(c))
+
+    def test_gradfactor(self):
+        x, eps = np.linspace(-5, 5, 21), 1e-6
+        for c, _, _, _ in self.reference:
+            if isinstance(c, Square):
+                x = np.abs(x) + .1
+            numerical = (c.f(x+eps) - c.f(x-eps)) / (2*eps)
+            np.testing.assert_allclose(c.gradfactor(c.f(x), np.ones_like(x)), numerical, rtol=1e-6, err_msg=str(c))
+
+    def test_batch(self):
+        X = np.random.normal(0, 10, (4, 7))
+        dF = np.random.normal(0, 1, X.shape)
+        for c, _, _, _ in self.reference:
+            F = c.f(X)
+            np.testing.assert_array_equal(F, np.array([c.f(x) for x in X]))
+            np.testing.assert_array_equal(c.finv(F), np.array([c.finv(f) for f in F]))
+            np.testing.assert_array_equal(c.gradfactor(F, dF), np.array([c.gradfactor(f, df) for f, df in zip(F, dF)]))
+
+    def test_no_out(self):
+        class OldStyle(transformations.Logexp):
+            def f(self, x):
+                return transformations.Logexp.f(self, x)
+        self.assertFalse(OldStyle().supports_out())
+        self.assertTrue(Logexp().supports_out())
+
+    def test_accepts_out_without_signature(self):
+        # python 2 has no inspect.signature, the arguments get looked up instead:
+        import inspect
+        if not hasattr(inspect, 'getfullargspec'):
+            return
+        signature, getargspec = inspect.signature, getattr(inspect, 'getargspec', None)
+        try:
+            del inspect.signature
+            inspect.getargspec = inspect.getfullargspec
+            self.assertTrue(transformations._accepts_out(Logexp().f))
+            self.assertFalse(transformations._accepts_out(lambda x: x))
+        finally:
+            inspect.signature = signature
+            if getargspec is None:
+                del inspect.getargspec
+            else:
+                inspect.getargspec = getargspec
+
+if __name__ == "__main__":
+    #import sys;sys.argv = ['', 'Test.test_parameter_index_operations']
+    unittest.main()
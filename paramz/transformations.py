@@ -50,16 +50,57 @@ UNFIXED = True
 #===============================================================================
 logger = logging.getLogger(__name__)
 
+def _out(x, out):
+    """
+    Return the array to write the result of a transformation of x into.
+    """
+    if out is None:
+        return np.empty(np.shape(x), dtype=np.result_type(x, 1.))
+    return out
+
+def _workspace(workspace, out, *inputs):
+    """
+    Return a buffer for intermediate results of the shape of out, which
+    does not share memory with any of the inputs. This is out itself, if
+    possible, else the workspace (or a new array, if no workspace was given).
+    """
+    for x in inputs:
+        if np.may_share_memory(out, x):
+            if workspace is None or np.may_share_memory(workspace, x):
+                return np.empty_like(out)
+            return workspace
+    return out
+
+_supports_out = dict()
+
+def _accepts_out(method):
+    """
+    Whether the function or method accepts an argument called out.
+    """
+    import inspect
+    if hasattr(inspect, 'signature'):
+        return 'out' in inspect.signature(method).parameters
+    return 'out' in inspect.getargspec(method).args # python 2
+
 class Transformation(object):
+    """
+    The transformations f, finv and gradfactor can write their results into
+    a given array `out` (which may be one of the inputs), in which case no
+    new array gets allocated. Some transformations need a buffer for
+    intermediate results, if `out` is one of the inputs; pass a `workspace`
+    array of the same shape to avoid allocating it.
+
+    Without `out`, a new array will be returned.
+    """
     domain = None
     _instance = None
     def __new__(cls, *args, **kwargs):
         if not cls._instance or cls._instance.__class__ is not cls:
             cls._instance = super(Transformation, cls).__new__(cls, *args, **kwargs)
         return cls._instance
-    def f(self, opt_param):
+    def f(self, opt_param, out=None, workspace=None):
         raise NotImplementedError
-    def finv(self, model_param):
+    def finv(self, model_param, out=None, workspace=None):
         raise NotImplementedError
     def log_jacobian(self, model_param):
         """
@@ -73,7 +114,7 @@ class Transformation(object):
         """
         logger.warning("gradient of log Jacobian for transformation {} not implemented, approximating by 0.".format(self.__class__))
         return 0.
-    def gradfactor(self, model_param, dL_dmodel_param):
+    def gradfactor(self, model_param, dL_dmodel_param, out=None, workspace=None):
         """ df(opt_param)_dopt_param evaluated at self.f(opt_param)=model_param, times the gradient dL_dmodel_param,
 
         i.e.:
@@ -84,6 +125,25 @@ class Transformation(object):
             \frac{\frac{\partial L}{\partial f}\left(\left.\partial f(x)}{\partial x}\right|_{x=f^{-1}(f)\right)}
         """
         raise NotImplementedError
+    def supports_out(self):
+        """
+        Whether f, finv and gradfactor of this transformation accept the
+        `out` and `workspace` arguments (transformations implemented
+        before the argument existed do not).
+        """
+        cls = self.__class__
+        if cls not in _supports_out:
+            _supports_out[cls] = all(_accepts_out(getattr(self, name)) for name in ('f', 'finv', 'gradfactor'))
+        return _supports_out[cls]
+    def bounds(self):
+        """
+        The (lower, upper) bounds of the domain of this transformation in
+        model space, None meaning unbounded. Optimizers, which handle box
+        bounds natively, can use these bounds instead of the transformation.
+
+        Returns None, if the domain cannot be expressed as box bounds.
+        """
+        return None
     def gradfactor_non_natural(self, model_param, dL_dmodel_param):
         return self.gradfactor(model_param, dL_dmodel_param)
     def initialize(self, f):
@@ -104,13 +164,31 @@ class Transformation(object):
 
 class Logexp(Transformation):
     domain = _POSITIVE
-    def f(self, x):
-        return np.where(x>_lim_val, x, np.log1p(np.exp(np.clip(x, -_log_lim_val, _lim_val)))) #+ epsilon
+    def f(self, x, out=None, workspace=None):
+        # log1p(exp(x)) > x, up to _lim_val, where it equals x numerically:
+        out = _out(x, out)
+        w = _workspace(workspace, out, x)
+        np.clip(x, -_log_lim_val, _lim_val, out=w)
+        np.exp(w, out=w)
+        np.log1p(w, out=w)
+        return np.maximum(x, w, out=out) #+ epsilon
         #raises overflow warning: return np.where(x>_lim_val, x, np.log(1. + np.exp(x)))
-    def finv(self, f):
-        return np.where(f>_lim_val, f, np.log(np.expm1(f)))
-    def gradfactor(self, f, df):
-        return df*np.where(f>_lim_val, 1.,  - np.expm1(-f))
+    def finv(self, f, out=None, workspace=None):
+        # log(expm1(f)) = f + log(-expm1(-f)), which does not overflow:
+        out = _out(f, out)
+        w = _workspace(workspace, out, f)
+        np.negative(f, out=w)
+        np.expm1(w, out=w)
+        np.negative(w, out=w)
+        np.log(w, out=w)
+        return np.add(f, w, out=out)
+    def gradfactor(self, f, df, out=None, workspace=None):
+        out = _out(f, out)
+        w = _workspace(workspace, out, df)
+        np.negative(f, out=w)
+        np.expm1(w, out=w)
+        np.negative(w, out=w)
+        return np.multiply(df, w, out=out)
     def initialize(self, f):
         if np.any(f < 0.):
             logger.info("Warning: changing parameters to satisfy constraints")
@@ -119,17 +197,21 @@ class Logexp(Transformation):
         return np.where(model_param>_lim_val, model_param, np.log(np.expm1(model_param))) - model_param
     def log_jacobian_grad(self, model_param):
         return 1./(np.expm1(model_param))
+    def bounds(self):
+        return (epsilon, None)
     def __str__(self):
         return '+ve'
 
 class Exponent(Transformation):
     domain = _POSITIVE
-    def f(self, x):
-        return np.where(x<_lim_val, np.where(x>-_lim_val, np.exp(x), np.exp(-_lim_val)), np.exp(_lim_val))
-    def finv(self, x):
-        return np.log(x)
-    def gradfactor(self, f, df):
-        return np.einsum('i,i->i', df, f)
+    def f(self, x, out=None, workspace=None):
+        out = _out(x, out)
+        np.clip(x, -_lim_val, _lim_val, out=out)
+        return np.exp(out, out=out)
+    def finv(self, x, out=None, workspace=None):
+        return np.log(x, out=_out(x, out))
+    def gradfactor(self, f, df, out=None, workspace=None):
+        return np.multiply(df, f, out=_out(f, out))
     def initialize(self, f):
         if np.any(f < 0.):
             logger.info("Warning: changing parameters to satisfy constraints")
@@ -138,46 +220,67 @@ class Exponent(Transformation):
         return np.log(model_param)
     def log_jacobian_grad(self, model_param):
         return 1./model_param
+    def bounds(self):
+        return (epsilon, None)
     def __str__(self):
         return '+ve'
 
 class NegativeLogexp(Transformation):
     domain = _NEGATIVE
     logexp = Logexp()
-    def f(self, x):
-        return -self.logexp.f(x)  # np.log(1. + np.exp(x))
-    def finv(self, f):
-        return self.logexp.finv(-f)  # np.log(np.exp(-f) - 1.)
-    def gradfactor(self, f, df):
-        return self.logexp.gradfactor(-f, -df)
+    def f(self, x, out=None, workspace=None):
+        out = self.logexp.f(x, out, workspace)  # np.log(1. + np.exp(x))
+        return np.negative(out, out=out)
+    def finv(self, f, out=None, workspace=None):
+        out = np.negative(f, out=_out(f, out))
+        return self.logexp.finv(out, out, workspace)  # np.log(np.exp(-f) - 1.)
+    def gradfactor(self, f, df, out=None, workspace=None):
+        # self.logexp.gradfactor(-f, -df)
+        out = _out(f, out)
+        w = _workspace(workspace, out, df)
+        np.expm1(f, out=w)
+        return np.multiply(df, w, out=out)
     def initialize(self, f):
         return -self.logexp.initialize(-f)  # np.abs(f)
+    def bounds(self):
+        return (None, -epsilon)
     def __str__(self):
         return '-ve'
 
 class NegativeExponent(Exponent):
     domain = _NEGATIVE
-    def f(self, x):
-        return -Exponent.f(self, x)
-    def finv(self, f):
-        return -Exponent.finv(self, -f)
-    def gradfactor(self, f, df):
-        return -Exponent.gradfactor(self, f, df)
+    def f(self, x, out=None, workspace=None):
+        out = Exponent.f(self, x, out, workspace)
+        return np.negative(out, out=out)
+    def finv(self, f, out=None, workspace=None):
+        out = np.negative(f, out=_out(f, out))
+        return Exponent.finv(self, out, out, workspace)
+    def gradfactor(self, f, df, out=None, workspace=None):
+        # d(-exp(x))/dx = -exp(x) = f
+        return Exponent.gradfactor(self, f, df, out, workspace)
     def initialize(self, f):
         return -Exponent.initialize(self, f) #np.abs(f)
+    def bounds(self):
+        return (None, -epsilon)
     def __str__(self):
         return '-ve'
 
 class Square(Transformation):
     domain = _POSITIVE
-    def f(self, x):
-        return x ** 2
-    def finv(self, x):
-        return np.sqrt(x)
-    def gradfactor(self, f, df):
-        return np.einsum('i,i->i', df, 2 * np.sqrt(f))
+    def f(self, x, out=None, workspace=None):
+        return np.square(x, out=_out(x, out))
+    def finv(self, x, out=None, workspace=None):
+        return np.sqrt(x, out=_out(x, out))
+    def gradfactor(self, f, df, out=None, workspace=None):
+        out = _out(f, out)
+        w = _workspace(workspace, out, df)
+        np.sqrt(f, out=w)
+        np.multiply(w, 2, out=w)
+        return np.multiply(df, w, out=out)
     def initialize(self, f):
         return np.abs(f)
+    def bounds(self):
+        return (0., None)
     def __str__(self):
         return '+sq'
 
@@ -201,21 +304,52 @@ class Logistic(Transformation):
         assert lower < upper
         self.lower, self.upper = float(lower), float(upper)
         self.difference = self.upper - self.lower
-    def f(self, x):
-        if (x<-300.).any():
-            x = x.copy()
-            x[x<-300.] = -300.
-        return self.lower + self.difference / (1. + np.exp(-x))
-    def finv(self, f):
-        return np.log(np.clip(f - self.lower, 1e-10, np.inf) / np.clip(self.upper - f, 1e-10, np.inf))
-    def gradfactor(self, f, df):
-        return np.einsum('i,i->i', df, (f - self.lower) * (self.upper - f) / self.difference)
+    def f(self, x, out=None, workspace=None):
+        out = _out(x, out)
+        np.maximum(x, -300., out=out)
+        np.negative(out, out=out)
+        np.exp(out, out=out)
+        np.add(out, 1., out=out)
+        np.divide(self.difference, out, out=out)
+        return np.add(out, self.lower, out=out)
+    def finv(self, f, out=None, workspace=None):
+        # log(clip(f - lower) / clip(upper - f)):
+        out = _out(f, out)
+        w = workspace
+        if w is None or np.may_share_memory(w, f) or np.may_share_memory(w, out):
+            w = np.empty_like(out)
+        np.subtract(self.upper, f, out=w)
+        np.maximum(w, 1e-10, out=w)
+        np.subtract(f, self.lower, out=out)
+        np.maximum(out, 1e-10, out=out)
+        np.divide(out, w, out=out)
+        return np.log(out, out=out)
+    def gradfactor(self, f, df, out=None, workspace=None):
+        # df * (f - lower) * (upper - f) / difference:
+        if out is not None and np.may_share_memory(out, f) and np.may_share_memory(out, df):
+            out[...] = self.gradfactor(f, df, None, workspace)
+            return out
+        out = _out(f, out)
+        w = workspace
+        if w is None or np.may_share_memory(w, f) or np.may_share_memory(w, df) or np.may_share_memory(w, out):
+            w = np.empty_like(out)
+        np.subtract(self.upper, f, out=w)
+        if np.may_share_memory(out, df):
+            np.multiply(df, w, out=out)
+            np.subtract(f, self.lower, out=w)
+        else:
+            np.subtract(f, self.lower, out=out)
+            np.multiply(df, w, out=w)
+        np.multiply(out, w, out=out)
+        return np.divide(out, self.difference, out=out)
     def initialize(self, f):
         if np.any(np.logical_or(f < self.lower, f > self.upper)):
             logger.info("Warning: changing parameters to satisfy constraints")
         #return np.where(np.logical_or(f < self.lower, f > self.upper), self.f(f * 0.), f)
         #FIXME: Max, zeros_like right?
         return np.where(np.logical_or(f < self.lower, f > self.upper), self.f(np.zeros_like(f)), f)
+    def bounds(self):
+        return (self.lower, self.upper)
     def __str__(self):
         return '{},{}'.format(self.lower, self.upper)
 